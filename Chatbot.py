@@ -7,51 +7,76 @@ and answers user questions based on their combined context.
 
 import os
 import sys
-from groq import Groq
+import mmap
+import string
+import asyncio
+from typing import Dict, Tuple
+from GroqUtils import ResponseCache, acollect_stream, ainput, get_async_client, print_token, run
+
+REPORT_PATHS = ("market_research_analysis.md", "execution_plan.md", "strategic_analysis.md")
+
+# Decoded reports keyed by absolute path, tagged with the mtime they were read at
+_REPORT_CACHE: Dict[str, Tuple[int, str]] = {}
 
 def load_report(path: str) -> str:
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+        stat = os.stat(path)
     except FileNotFoundError:
         return f"[[REPORT NOT FOUND: {path}]]"
 
-def build_prompt(mr: str, ep: str, sa: str, question: str) -> str:
-    return f"""
+    key = os.path.abspath(path)
+    cached = _REPORT_CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime_ns:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        if stat.st_size == 0:
+            report = ""
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                report = str(mapped, 'utf-8')
+    _REPORT_CACHE[key] = (stat.st_mtime_ns, report)
+    return report
+
+# Compiled once at import; build_prompt only substitutes the reports and question
+_PROMPT_TPL = string.Template("""
 You are an expert innovation agent assistant. Answer the user's question using ONLY the information
 from the following three reports. Provide a clear, concise answer.
 
 --- MARKET RESEARCH REPORT ---
-{mr}
+$mr
 
 --- EXECUTION PLAN REPORT ---
-{ep}
+$ep
 
 --- STRATEGIC ANALYSIS REPORT ---
-{sa}
+$sa
 
 --- USER QUESTION ---
-{question}
-"""
+$question
+""")
+
+def build_prompt(mr: str, ep: str, sa: str, question: str) -> str:
+    return _PROMPT_TPL.substitute(mr=mr, ep=ep, sa=sa, question=question)
 
-def main():
-    # Load API key
-    api_key = os.getenv("GROQ_API_KEY") or "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"
-    client = Groq(api_key=api_key)
+async def main():
+    client = get_async_client()
     model = "openai/gpt-oss-120b"
+    cache = ResponseCache()
 
-    # Load reports
-    mr = load_report("market_research_analysis.md")
-    ep = load_report("execution_plan.md")
-    sa = load_report("strategic_analysis.md")
+    # Load reports concurrently in worker threads; they are awaited once the first question arrives
+    reports = asyncio.gather(*(asyncio.to_thread(load_report, path) for path in REPORT_PATHS))
+    mr = ep = sa = None
 
     print("Innovation Agent CLI Chatbot")
     print("Type your question or 'exit' to quit.")
 
     while True:
         try:
-            question = input("\n> ").strip()
-        except (EOFError, KeyboardInterrupt):
+            # Read from a worker thread so the report loads keep progressing on the event loop
+            question = (await ainput("\n> ")).strip()
+        except (EOFError, KeyboardInterrupt, asyncio.CancelledError):
+            # Ctrl-C reaches the loop as a cancellation of main() rather than a KeyboardInterrupt
             print("\nExiting.")
             break
 
@@ -59,23 +84,36 @@ def main():
             print("Exiting.")
             break
 
+        if mr is None:
+            mr, ep, sa = await reports
+
         prompt = build_prompt(mr, ep, sa, question)
+        messages = [
+            {"role": "system", "content": "You are a helpful innovation agent assistant."},
+            {"role": "user", "content": prompt}
+        ]
+        params = {"temperature": 0.7, "max_tokens": 800, "top_p": 0.9}
+        cache_key = ResponseCache.make_key(model, messages, **params)
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful innovation agent assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800,
-                top_p=0.9,
-                stream=False
-            )
-            answer = response.choices[0].message.content.strip()
-            print(f"\n{answer}\n")
+            print()
+            answer = cache.get(cache_key)
+            if answer is not None:
+                print_token(answer)
+            else:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    **params
+                )
+                answer = (await acollect_stream(response, on_token=print_token))["content"]
+                cache.set(cache_key, answer)
+            print("\n")
         except Exception as e:
             print(f"Error: {e}")
 
+    # Let the background loads finish before the event loop shuts down
+    await asyncio.gather(reports, return_exceptions=True)
+
 if __name__ == "__main__":
-    main()
+    run(main())
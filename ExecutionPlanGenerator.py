@@ -8,56 +8,61 @@ using web search for implementation strategies and chain-of-thought reasoning fo
 """
 
 import os
-import json
+import re
 import asyncio
+import string
+import functools
+from collections import Counter
 from datetime import datetime
-from groq import Groq, RateLimitError
-from typing import Dict, Any, Optional
-
-class ExecutionPlanGenerator:
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = Groq(
-            api_key=api_key or "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"
-        )
-        self.compound_model = "groq/compound"
-        self.reasoning_model = "openai/gpt-oss-120b"
-        
-    def get_web_research_prompt(self, user_idea: str, market_report: str) -> str:
-        """
-        Generate a concise prompt for web research on execution strategies.
-        """
-        prompt = f"""You are a business strategy researcher. Use your web search capabilities to find current, real-world implementation strategies for a business idea.
-
-**USER IDEA**: {user_idea}
-
-**MARKET CONTEXT (Summary)**: {market_report[:1500]}...
-
-**CRITICAL WEB SEARCH TASKS**:
-- Search for case studies of similar successful startups.
-- Search for typical resource requirements (funding, team size).
-- Search for common technology stacks and development timelines.
-- Search for key regulatory hurdles and compliance needs.
-- Search for common challenges and pitfalls to avoid.
+from groq import AsyncGroq
+from typing import Dict, Any, Optional, Tuple
+from GroqUtils import (ResponseCache, acollect_stream, ainput, print_token, retry_async, TokenCallback,
+                       count_tokens, truncate_tokens, get_async_client, resolve_api_key, run, LoopSemaphore)
+
+# Independent research topics, each issued as its own concurrent web-search request
+RESEARCH_TASKS = (
+    ("Case Studies", "Search for case studies of similar successful startups."),
+    ("Resource Requirements", "Search for typical resource requirements (funding, team size)."),
+    ("Technology & Timelines", "Search for common technology stacks and development timelines."),
+    ("Regulatory & Compliance", "Search for key regulatory hurdles and compliance needs."),
+    ("Challenges & Pitfalls", "Search for common challenges and pitfalls to avoid."),
+)
+
+# Token budget for the market report once condensed into prompt context
+MARKET_CONTEXT_TOKENS = 500
+# Context window of the reasoning model and the completion budget reserved for the plan
+REASONING_CONTEXT_TOKENS = 128_000
+PLAN_MAX_TOKENS = 8000
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+_WORD_RE = re.compile(r'[a-z0-9]{3,}')
+
+# Static fragments of the per-task web research prompt, joined around the variable parts
+_WEB_RESEARCH_PREFIX = """You are a business strategy researcher. Use your web search capabilities to find current, real-world implementation strategies for a business idea.
+
+**USER IDEA**: """
+_WEB_RESEARCH_MID = """
+
+**MARKET CONTEXT (Summary)**: """
+_WEB_RESEARCH_TASK = """...
+
+**CRITICAL WEB SEARCH TASK**:
+- """
+_WEB_RESEARCH_SUFFIX = """
 
 **OUTPUT REQUIREMENTS**:
-Provide a concise research summary with actionable data. Include company names, realistic timelines, funding estimates, and key challenges. Organize findings into clear sections for execution planning.
+Provide a concise research summary with actionable data. Include company names, realistic timelines, funding estimates, and key challenges where relevant.
 
 Begin web research now:"""
-        return prompt
 
-    def get_execution_planning_prompt(self, user_idea: str, market_report: str, web_research_data: str) -> str:
-        """
-        Generate a concise prompt for chain-of-thought execution planning.
-        """
-        prompt = f"""You are a world-class business strategist. Create a comprehensive, step-by-step execution plan using chain-of-thought reasoning.
+_PLANNING_PROMPT_TPL = string.Template("""You are a world-class business strategist. Create a comprehensive, step-by-step execution plan using chain-of-thought reasoning.
 
-**USER IDEA**: {user_idea}
+**USER IDEA**: $user_idea
 
 **MARKET CONTEXT (Summary)**:
-{market_report[:1500]}
+$market_report
 
 **WEB RESEARCH FINDINGS (Summary)**:
-{web_research_data[:2000]}
+$web_research_data
 
 **CHAIN-OF-THOUGHT INSTRUCTIONS**:
 For each phase of the plan, briefly explain your reasoning, covering the objective, key steps, deliverables, and potential risks.
@@ -78,75 +83,224 @@ Create a multi-phase plan covering the first 24 months. Each phase should includ
 - Be detailed, specific, and actionable.
 - Use data from the market and web research to support your recommendations.
 
-Begin your chain-of-thought execution planning now:"""
-        return prompt
+Begin your chain-of-thought execution planning now:""")
 
-    async def research_execution_strategies(self, user_idea: str, market_report: str) -> Dict[str, Any]:
-        research_prompt = self.get_web_research_prompt(user_idea, market_report)
-        max_retries = 3
-        retry_delay = 61
+# Stands in for the research findings until they arrive; cannot occur in user text
+_RESEARCH_SLOT = "\x00WEB_RESEARCH\x00"
 
-        print("🔍 Conducting web research on execution strategies...")
-        for attempt in range(max_retries):
-            try:
-                completion = self.client.chat.completions.create(
+_RESEARCH_SYSTEM_PROMPT = "You are a business strategy researcher with real-time web search. Find current implementation strategies, case studies, and resource requirements for the user's idea."
+_PLANNING_SYSTEM_PROMPT = "You are a world-class business strategist. Use chain-of-thought reasoning to create comprehensive, actionable execution plans based on the provided research."
+
+class ExecutionPlanGenerator:
+    def __init__(self, api_key: Optional[str] = None, max_concurrent_requests: int = 8,
+                 cache: Optional[ResponseCache] = None):
+        self.api_key = resolve_api_key(api_key)
+        # Caps in-flight Groq requests when research tasks fan out
+        self._semaphore = LoopSemaphore(max_concurrent_requests)
+        self.cache = cache or ResponseCache()
+        self.compound_model = "groq/compound"
+        self.reasoning_model = "openai/gpt-oss-120b"
+
+    @property
+    def client(self) -> AsyncGroq:
+        """Client shared with every other generator on the running event loop"""
+        return get_async_client(self.api_key)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _compress(text: str, max_tokens: int) -> str:
+        """
+        Extractively condense text to roughly max_tokens by keeping its most central sentences.
+
+        Each sentence is scored by how common its words are across the whole text
+        (a cheap TextRank-style centrality), the best sentences are kept until the
+        budget is spent, and they are returned in their original order.
+        """
+        if count_tokens(text) <= max_tokens:
+            return text
+
+        sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+        sentence_words = [set(_WORD_RE.findall(s.lower())) for s in sentences]
+        frequency = Counter(word for words in sentence_words for word in words)
+
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: sum(frequency[w] for w in sentence_words[i]) / (len(sentence_words[i]) or 1),
+            reverse=True
+        )
+        selected = []
+        used = 0
+        for i in ranked:
+            length = count_tokens(sentences[i]) + 1
+            if used + length > max_tokens:
+                continue
+            selected.append(i)
+            used += length
+        if not selected:
+            # No sentence fits on its own (e.g. one long unpunctuated block), so keep the head
+            return truncate_tokens(text, max_tokens)
+        return "\n".join(sentences[i] for i in sorted(selected))
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def get_web_research_prompt(user_idea: str, market_report: str, task: str) -> str:
+        """
+        Generate a concise prompt for one focused web research task on execution strategies.
+        """
+        return "".join((
+            _WEB_RESEARCH_PREFIX, user_idea,
+            _WEB_RESEARCH_MID, ExecutionPlanGenerator._compress(market_report, MARKET_CONTEXT_TOKENS),
+            _WEB_RESEARCH_TASK, task,
+            _WEB_RESEARCH_SUFFIX,
+        ))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _planning_prompt_frame(user_idea: str, market_report: str) -> Tuple[str, int]:
+        """
+        Build the planning prompt with a slot for the research findings.
+
+        Returns the prompt and the token budget for the findings: whatever is left of
+        the model's context window after the plan budget, the static prompt text, the
+        idea and the condensed market report.
+        """
+        market_context = ExecutionPlanGenerator._compress(market_report, MARKET_CONTEXT_TOKENS)
+        research_budget = (
+            REASONING_CONTEXT_TOKENS - PLAN_MAX_TOKENS
+            - count_tokens(_PLANNING_SYSTEM_PROMPT) - count_tokens(_PLANNING_PROMPT_TPL.template)
+            - count_tokens(user_idea) - count_tokens(market_context)
+        )
+        frame = _PLANNING_PROMPT_TPL.substitute(
+            user_idea=user_idea,
+            market_report=market_context,
+            web_research_data=_RESEARCH_SLOT,
+        )
+        return frame, max(research_budget, 0)
+
+    @staticmethod
+    def get_execution_planning_prompt(user_idea: str, market_report: str, web_research_data: str) -> str:
+        """
+        Generate a concise prompt for chain-of-thought execution planning.
+        """
+        frame, research_budget = ExecutionPlanGenerator._planning_prompt_frame(user_idea, market_report)
+        return ExecutionPlanGenerator._fill_research_slot(frame, research_budget, web_research_data)
+
+    @staticmethod
+    def _fill_research_slot(frame: str, research_budget: int, web_research_data: str) -> str:
+        """Splice the research findings, cut to research_budget tokens, into a planning prompt frame"""
+        return frame.replace(_RESEARCH_SLOT, truncate_tokens(web_research_data, research_budget), 1)
+
+    async def _research_task(self, research_prompt: str) -> str:
+        messages = [
+            {"role": "system", "content": _RESEARCH_SYSTEM_PROMPT},
+            {"role": "user", "content": research_prompt}
+        ]
+        params = {"temperature": 0.6, "max_tokens": 1500}
+        cache_key = ResponseCache.make_key(self.compound_model, messages, **params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        async def request() -> str:
+            # Streamed so each finding is accumulated as it arrives rather than in one final body
+            async with self._semaphore:
+                completion = await self.client.chat.completions.create(
                     model=self.compound_model,
-                    messages=[
-                        {"role": "system", "content": "You are a business strategy researcher with real-time web search. Find current implementation strategies, case studies, and resource requirements for the user's idea."},
-                        {"role": "user", "content": research_prompt}
-                    ],
-                    temperature=0.6,
-                    max_tokens=6000,
-                    stream=False
+                    messages=messages,
+                    stream=True,
+                    **params
                 )
-                return {
-                    "research_data": completion.choices[0].message.content,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            except RateLimitError as e:
-                if attempt < max_retries - 1:
-                    print(f"⚠️ Rate limit reached. Retrying in {retry_delay} seconds...")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    error_message = f"Web research failed after {max_retries} attempts due to persistent rate limiting."
-                    print(f"❌ {error_message}")
-                    return {"error": error_message, "details": str(e), "research_data": "Not available."}
-            except Exception as e:
-                error_message = f"An unexpected error occurred during web research: {e}"
-                print(f"❌ {error_message}")
-                return {"error": error_message, "research_data": "Not available."}
-        return {"error": "Web research failed after all retries.", "research_data": "Not available."}
-
-    async def generate_execution_plan(self, user_idea: str = None, market_report: str = None) -> Dict[str, Any]:
-        if not user_idea: user_idea = input("✍️ Enter your business idea: ")
-        if not market_report: market_report = input("📋 Paste or provide path to market research: ")
+                streamed = await acollect_stream(completion)
+            return streamed["content"]
+
+        content = await retry_async(request)
+        self.cache.set(cache_key, content)
+        return content
+
+    async def research_execution_strategies(self, user_idea: str, market_report: str) -> Dict[str, Any]:
+        print("🔍 Conducting web research on execution strategies...")
+        # Condense once; the per-task prompt builders see it is already within budget
+        market_context = self._compress(market_report, MARKET_CONTEXT_TOKENS)
+        results = await asyncio.gather(
+            *(self._research_task(self.get_web_research_prompt(user_idea, market_context, task))
+              for _, task in RESEARCH_TASKS),
+            return_exceptions=True
+        )
+
+        sections = []
+        failures = []
+        for (title, _), result in zip(RESEARCH_TASKS, results):
+            if isinstance(result, BaseException):
+                failures.append(f"{title}: {result}")
+            else:
+                sections.append(f"## {title}\n{result}")
+
+        if not sections:
+            error_message = f"Web research failed for all {len(RESEARCH_TASKS)} research tasks."
+            print(f"❌ {error_message}")
+            return {"error": error_message, "details": "; ".join(failures), "research_data": "Not available."}
+
+        research = {
+            "research_data": "\n\n".join(sections),
+            "timestamp": datetime.now().isoformat(),
+        }
+        if failures:
+            research["error"] = f"{len(failures)} of {len(RESEARCH_TASKS)} research tasks failed."
+            research["details"] = "; ".join(failures)
+        return research
+
+    async def generate_execution_plan(self, user_idea: str = None, market_report: str = None,
+                                      on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        # Prompt from a worker thread so the event loop stays free while the user types
+        if not user_idea: user_idea = await ainput("✍️ Enter your business idea: ")
+        if not market_report: market_report = await ainput("📋 Paste or provide path to market research: ")
 
         print(f"\n🚀 Generating execution plan for: {user_idea[:100]}...")
-        web_research = await self.research_execution_strategies(user_idea, market_report)
+        # Condense the report once and reuse it for both the research and planning prompts
+        market_context = self._compress(market_report, MARKET_CONTEXT_TOKENS)
+        # Template and token-count the planning prompt in a worker thread while the research is in flight
+        web_research, (frame, research_budget) = await asyncio.gather(
+            self.research_execution_strategies(user_idea, market_context),
+            asyncio.to_thread(self._planning_prompt_frame, user_idea, market_context),
+        )
         
         if "error" in web_research:
             print(f"⚠️ Web research warning: {web_research['error']}")
         
-        planning_prompt = self.get_execution_planning_prompt(user_idea, market_report, web_research.get('research_data', ''))
+        planning_prompt = self._fill_research_slot(frame, research_budget, web_research.get('research_data', ''))
         
         print("🧠 Applying chain-of-thought reasoning for execution planning...")
+        messages = [
+            {"role": "system", "content": _PLANNING_SYSTEM_PROMPT},
+            {"role": "user", "content": planning_prompt}
+        ]
+        params = {"temperature": 0.7, "max_tokens": PLAN_MAX_TOKENS, "top_p": 0.9}
+        cache_key = ResponseCache.make_key(self.reasoning_model, messages, **params)
+
+        async def request() -> str:
+            async with self._semaphore:
+                completion = await self.client.chat.completions.create(
+                    model=self.reasoning_model,
+                    messages=messages,
+                    stream=True,
+                    **params
+                )
+                streamed = await acollect_stream(completion, on_token)
+            return streamed["content"]
+
         try:
-            completion = self.client.chat.completions.create(
-                model=self.reasoning_model,
-                messages=[
-                    {"role": "system", "content": "You are a world-class business strategist. Use chain-of-thought reasoning to create comprehensive, actionable execution plans based on the provided research."},
-                    {"role": "user", "content": planning_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=8000,
-                top_p=0.9,
-                stream=False
-            )
+            execution_plan = self.cache.get(cache_key)
+            if execution_plan is not None:
+                if on_token:
+                    on_token(execution_plan)
+            else:
+                execution_plan = await retry_async(request)
+                self.cache.set(cache_key, execution_plan)
             return {
                 "user_idea": user_idea,
                 "market_report": market_report,
                 "web_research_summary": web_research.get('research_data', ''),
-                "execution_plan": completion.choices[0].message.content,
+                "execution_plan": execution_plan,
                 "generation_timestamp": datetime.now().isoformat(),
             }
         except Exception as e:
@@ -157,38 +311,28 @@ Begin your chain-of-thought execution planning now:"""
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"execution_plan_{timestamp}.md"
         
-        report_content = f"""# Comprehensive Execution Plan
-
-**Business Idea**: {plan_result.get('user_idea', 'N/A')}
-**Plan Generated**: {plan_result.get('generation_timestamp', 'N/A')}
-
----
-
-## Market Research Context (Summary)
-{plan_result.get('market_report', 'Not available')[:1000]}...
-
----
-
-## Web Research Findings (Summary)
-{plan_result.get('web_research_summary', 'Not available')[:1000]}...
-
----
-
-# DETAILED EXECUTION PLAN
-
-{plan_result.get('execution_plan', 'Execution plan not available')}
----
-*Generated by Innovation Agent - Execution Plan Generator*
-"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        market_summary = plan_result.get('market_report', 'Not available')[:1000]
+        research_summary = plan_result.get('web_research_summary', 'Not available')[:1000]
+        # Written chunk by chunk so the multi-KB plan is never copied into one big report string
+        chunks = [
+            "# Comprehensive Execution Plan\n\n",
+            f"**Business Idea**: {plan_result.get('user_idea', 'N/A')}\n",
+            f"**Plan Generated**: {plan_result.get('generation_timestamp', 'N/A')}\n\n---\n\n",
+            "## Market Research Context (Summary)\n", market_summary, "...\n\n---\n\n",
+            "## Web Research Findings (Summary)\n", research_summary, "...\n\n---\n\n",
+            "# DETAILED EXECUTION PLAN\n\n",
+            plan_result.get('execution_plan', 'Execution plan not available'),
+            "\n---\n*Generated by Innovation Agent - Execution Plan Generator*\n",
+        ]
+        with open(filename, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+            f.writelines(chunks)
         return filename
 
 async def main():
     generator = ExecutionPlanGenerator()
     print("🚀 INNOVATION AGENT - EXECUTION PLAN GENERATOR")
     print("=" * 60)
-    plan_result = await generator.generate_execution_plan()
+    plan_result = await generator.generate_execution_plan(on_token=print_token)
     
     if "error" in plan_result:
         print(f"❌ Error: {plan_result['error']}")
@@ -196,13 +340,15 @@ async def main():
             print(f"   Details: {plan_result['details']}")
         return
     
-    print("\n📋 COMPREHENSIVE EXECUTION PLAN GENERATED")
+    print("\n\n📋 COMPREHENSIVE EXECUTION PLAN GENERATED")
     print("=" * 80)
-    print(plan_result["execution_plan"])
     
     saved_file = generator.save_execution_plan(plan_result)
     print(f"\n💾 Execution plan saved to: {saved_file}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        run(main())
+    except KeyboardInterrupt:
+        print("\nExiting.")
 
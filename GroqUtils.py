@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Innovation Agent - Shared Groq Helpers
+
+Small utilities shared by the Innovation Agent tools for consuming
+streamed Groq chat completions, retrying rate-limited requests and
+caching responses on disk.
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import asyncio
+import hashlib
+import tempfile
+import functools
+import threading
+import importlib.util
+from collections import OrderedDict, deque
+import httpx
+import orjson
+from groq import AsyncGroq, RateLimitError
+from typing import Deque, Dict, Any, Optional, Callable, Awaitable, TypeVar
+
+TokenCallback = Callable[[str], None]
+T = TypeVar("T")
+
+# Resolved once at import; every client falls back to it when no key is passed in
+API_KEY = os.environ.get("GROQ_API_KEY")
+
+# Shared AsyncGroq clients per event loop and key; an httpx pool cannot be used across loops
+_ASYNC_CLIENTS: Dict[asyncio.AbstractEventLoop, Dict[str, AsyncGroq]] = {}
+
+# Shared on-disk response cache, under XDG_CACHE_HOME when it is set
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "innovation_agent"
+)
+
+# Monotonic timestamps of the most recent rate-limit responses, shared by every caller
+_RECENT_RATE_LIMITS: Deque[float] = deque(maxlen=16)
+
+# Rough English density, used only when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def make_http_client() -> httpx.AsyncClient:
+    """
+    Keep-alive connection pool for AsyncGroq, multiplexed over HTTP/2 when h2 is installed
+
+    Pass it as AsyncGroq(http_client=...) so every request made through that
+    client reuses warm TCP/TLS connections instead of handshaking again.
+    """
+    return httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=httpx.Timeout(120.0, connect=10.0),
+    )
+
+
+def print_token(token: str) -> None:
+    """Write a streamed token straight to the terminal"""
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
+
+def get_async_client(api_key: Optional[str] = None) -> AsyncGroq:
+    """
+    Shared AsyncGroq client for the running event loop
+
+    Every caller on the same loop with the same key gets one client and its
+    connection pool; a new loop (e.g. each asyncio.run) gets a fresh client,
+    and clients belonging to closed loops are dropped.
+    """
+    _drop_closed_loops(_ASYNC_CLIENTS)
+
+    api_key = resolve_api_key(api_key)
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(api_key)
+    if client is None:
+        client = clients[api_key] = AsyncGroq(api_key=api_key, http_client=make_http_client())
+    return client
+
+
+def _drop_closed_loops(per_loop: Dict[asyncio.AbstractEventLoop, Any]) -> None:
+    """Forget per-loop objects whose event loop has been closed"""
+    for loop in [loop for loop in list(per_loop) if loop.is_closed()]:
+        per_loop.pop(loop, None)
+
+
+class LoopSemaphore:
+    """
+    asyncio.Semaphore with one underlying semaphore per event loop
+
+    A plain Semaphore binds to the first loop that waits on it, so an object
+    that outlives one asyncio.run (or is shared between threads, each with its
+    own loop) would fail on the next. This one can be held for the object's
+    whole lifetime and used as `async with` from any loop.
+    """
+
+    def __init__(self, value: int):
+        self.value = value
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            _drop_closed_loops(self._semaphores)
+            semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self.value))
+        return semaphore
+
+    async def __aenter__(self) -> None:
+        await self._semaphore().acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore().release()
+
+
+def resolve_api_key(api_key: Optional[str] = None) -> str:
+    """Return api_key, or the GROQ_API_KEY environment key when it is not given"""
+    api_key = api_key or API_KEY
+    if not api_key:
+        raise RuntimeError("No Groq API key configured; set the GROQ_API_KEY environment variable")
+    return api_key
+
+
+async def close_async_client(api_key: Optional[str] = None) -> None:
+    """
+    Close the shared client for the running event loop and key, releasing its connections
+
+    A later get_async_client call on the same loop opens a fresh client.
+    """
+    clients = _ASYNC_CLIENTS.get(asyncio.get_running_loop(), {})
+    client = clients.pop(api_key or API_KEY, None)
+    if client is not None:
+        await client.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding():
+    """o200k_base encoder used by the gpt-oss models, or None when tiktoken is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of prompt tokens in text, estimated from its length without tiktoken"""
+    encoding = _encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens prompt tokens"""
+    encoding = _encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """orjson fallback for SDK objects such as the executed tool records"""
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    return str(obj)
+
+
+def to_json_bytes(data: Any) -> bytes:
+    """Serialize a result dict to indented UTF-8 JSON with orjson"""
+    return orjson.dumps(data, default=_to_jsonable, option=orjson.OPT_INDENT_2)
+
+
+class _StreamAccumulator:
+    """Collects content, reasoning, tool calls and usage from completion chunks"""
+
+    def __init__(self, on_token: Optional[TokenCallback] = None):
+        self.on_token = on_token
+        self.content = io.StringIO()
+        self.reasoning = io.StringIO()
+        self.executed_tools = []
+        self.usage = None
+
+    def feed(self, chunk) -> None:
+        if chunk.choices:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                self.content.write(delta.content)
+                if self.on_token:
+                    self.on_token(delta.content)
+            if getattr(delta, 'reasoning', None):
+                self.reasoning.write(delta.reasoning)
+            if getattr(delta, 'executed_tools', None):
+                self.executed_tools.extend(delta.executed_tools)
+
+        # Groq reports usage on the final chunk, either directly or under x_groq
+        usage = getattr(chunk, 'usage', None)
+        if usage is None and getattr(chunk, 'x_groq', None) is not None:
+            usage = chunk.x_groq.usage
+        if usage is not None:
+            self.usage = usage
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "content": self.content.getvalue(),
+            "reasoning": self.reasoning.getvalue(),
+            "executed_tools": self.executed_tools,
+            "usage": self.usage,
+        }
+
+
+def collect_stream(stream, on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+    """
+    Consume a streamed chat completion from the sync client
+
+    Args:
+        stream: Iterator returned by chat.completions.create(..., stream=True)
+        on_token: Optional callback invoked with each content delta as it arrives
+
+    Returns:
+        Dict with the accumulated content, reasoning, executed_tools and usage
+    """
+    accumulator = _StreamAccumulator(on_token)
+    for chunk in stream:
+        accumulator.feed(chunk)
+    return accumulator.result()
+
+
+class ResponseCache:
+    """
+    Disk-backed cache of completion text keyed by a hash of the request
+
+    Each entry is stored as its own JSON file and written atomically, so
+    concurrent processes never observe a partially written response. The
+    most recently used entries are also kept in memory, so repeated hits
+    within a process skip the disk entirely.
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_size: int = 256):
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        # The memory layer may be shared by threads, e.g. Streamlit sessions using one analyzer
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, messages, **params) -> str:
+        """Hash the model, messages and sampling parameters into a cache key"""
+        payload = orjson.dumps({"model": model, "messages": messages, **params}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(payload).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key: str, content: str) -> None:
+        with self._lock:
+            self._memory[key] = content
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                return content
+        try:
+            with open(self._path(key), 'rb') as f:
+                content = orjson.loads(f.read())["content"]
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(key, content)
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        """Store content; the disk write is best effort and never fails the caller"""
+        self._remember(key, content)
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps({"content": content}))
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with up to 50% jitter, capped at cap seconds"""
+    return min(cap, base * 2 ** attempt * (1 + random.random() * 0.5))
+
+
+def retry_after(error: RateLimitError) -> Optional[float]:
+    """Seconds the server asked us to wait in its Retry-After header, if it sent one"""
+    value = error.response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def recent_rate_limits(window: float = 60.0) -> int:
+    """Number of rate-limit responses seen in the last window seconds"""
+    now = time.monotonic()
+    return sum(1 for seen in _RECENT_RATE_LIMITS if now - seen <= window)
+
+
+async def rate_limit_pause(threshold: int = 4, window: float = 60.0, delay: float = 5.0) -> None:
+    """Hold back new submissions while the API has been rate limiting repeatedly"""
+    if recent_rate_limits(window) >= threshold:
+        await asyncio.sleep(delay * (1 + random.random() * 0.5))
+
+
+async def retry_async(coro_factory: Callable[[], Awaitable[T]], max_retries: int = 3,
+                      base: float = 1.0, cap: float = 30.0) -> T:
+    """
+    Await coro_factory(), retrying on rate limits with exponential backoff and jitter
+
+    Only RateLimitError is retried; anything else (AuthenticationError,
+    BadRequestError, ...) propagates immediately without sleeping. When the
+    server sends Retry-After, that wait (capped, plus jitter) is used instead
+    of the exponential schedule. The last RateLimitError is re-raised once
+    max_retries attempts are exhausted.
+
+    Args:
+        coro_factory: Zero-argument callable returning a fresh awaitable per attempt
+        max_retries: Total number of attempts
+        base: Delay in seconds before the first retry
+        cap: Upper bound on any single delay in seconds
+    """
+    for attempt in range(max_retries):
+        try:
+            return await coro_factory()
+        except RateLimitError as e:
+            _RECENT_RATE_LIMITS.append(time.monotonic())
+            if attempt == max_retries - 1:
+                raise
+            server_delay = retry_after(e)
+            if server_delay is None:
+                delay = backoff_delay(attempt, base, cap)
+            else:
+                delay = min(server_delay, cap) * (1 + random.random() * 0.5)
+            print(f"⚠️ Rate limit reached. Retrying in {delay:.1f} seconds... (Attempt {attempt + 1}/{max_retries})")
+            await asyncio.sleep(delay)
+
+
+async def to_daemon_thread(func: Callable[..., T], *args) -> T:
+    """
+    asyncio.to_thread for blocking console reads
+
+    The call runs on its own daemon thread instead of the default executor, so a read
+    still blocked after Ctrl-C cannot hold up event loop or interpreter shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target() -> None:
+        try:
+            result, error = func(*args), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            # The loop already shut down; nobody is waiting for this read any more
+            pass
+
+    threading.Thread(target=target, name="console-read", daemon=True).start()
+    return await future
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() that keeps the event loop running while it waits; see to_daemon_thread"""
+    return await to_daemon_thread(input, prompt)
+
+
+def run(main: Awaitable[T]) -> T:
+    """asyncio.run on uvloop's libuv-based event loop when uvloop is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """A new uvloop event loop when uvloop is installed, otherwise asyncio's default"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+async def acollect_stream(stream, on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+    """
+    Consume a streamed chat completion from the async client
+
+    Args:
+        stream: Async iterator returned by AsyncGroq chat.completions.create(..., stream=True)
+        on_token: Optional callback invoked with each content delta as it arrives
+
+    Returns:
+        Dict with the accumulated content, reasoning, executed_tools and usage
+    """
+    accumulator = _StreamAccumulator(on_token)
+    async for chunk in stream:
+        accumulator.feed(chunk)
+    return accumulator.result()
@@ -8,42 +8,42 @@ combining REAL web search data with AI reasoning to provide detailed business in
 """
 
 import os
-import json
-import asyncio
+import string
+import functools
+import orjson
 from datetime import datetime
-from groq import Groq, RateLimitError
+from groq import AsyncGroq, RateLimitError
 from typing import Dict, Any, Optional
+from GroqUtils import (acollect_stream, ainput, get_async_client, print_token, resolve_api_key, retry_async, run,
+                       TokenCallback, to_json_bytes, LoopSemaphore)
 
-class InnovationMarketResearcher:
-    def __init__(self, api_key: Optional[str] = None):
-        """
-        Initialize the Innovation Market Researcher with REAL web search
-        
-        Args:
-            api_key: Groq API key (if not provided, will use GROQ_API_KEY env var)
-        """
-        self.client = Groq(
-            api_key=api_key or "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"
-        )
-        self.model = "groq/compound"
-        
-    def get_universal_market_research_prompt(self, user_idea: str) -> str:
-        """
-        Generate a concise but comprehensive prompt for market research analysis.
-        """
-        prompt = f"""You are an expert market research analyst. Your task is to conduct a comprehensive analysis for a new business idea using REAL-TIME web search.
+# Required web searches, bundled into one structured request; each maps to a JSON field
+REQUIRED_WEB_SEARCHES = (
+    ("market_size", "{user_idea} market size and growth 2024 2025"),
+    ("competitors", "top competitors for {user_idea}"),
+    ("trends", "latest trends in the {user_idea} industry"),
+    ("funding", "venture capital funding in {user_idea} startups"),
+    ("pain_points", "customer needs and pain points for {user_idea}"),
+)
+
+_WEB_SEARCH_PROMPT_TPL = string.Template("""Perform the following web searches and report the findings as a single JSON object.
+
+$searches
 
-**USER IDEA**: {user_idea}
+Prioritize information from the last 12-18 months. Respond with JSON only, using exactly these keys:
+{"market_size": "...", "competitors": ["..."], "trends": ["..."], "funding": ["..."], "pain_points": ["..."]}
+
+Keep each entry short and factual, with specific statistics, company names, funding amounts, and source URLs.""")
+
+_MARKET_RESEARCH_PROMPT_TPL = string.Template("""You are an expert market research analyst. Your task is to conduct a comprehensive analysis for a new business idea using REAL-TIME web search.
+
+**USER IDEA**: $user_idea
 
 **CRITICAL INSTRUCTIONS**:
-You MUST use your web search capabilities to find current, real-time data. Prioritize information from the last 12-18 months.
+Use the current, real-time web search findings below, and search further where they are incomplete. Prioritize information from the last 12-18 months.
 
-**REQUIRED WEB SEARCHES**:
-- Search for "{user_idea} market size and growth 2024 2025"
-- Search for "top competitors for {user_idea}"
-- Search for "latest trends in the {user_idea} industry"
-- Search for "venture capital funding in {user_idea} startups"
-- Search for "customer needs and pain points for {user_idea}"
+**WEB SEARCH FINDINGS**:
+$search_findings
 
 **REQUIRED ANALYSIS STRUCTURE**:
 Based on your web search, provide a detailed report covering these core areas:
@@ -61,71 +61,153 @@ Based on your web search, provide a detailed report covering these core areas:
 - Cite sources with URLs where possible.
 - Provide a confident, expert-level analysis.
 
-Begin your comprehensive market research now:"""
-        return prompt
+Begin your comprehensive market research now:""")
+
+_MARKET_RESEARCH_SYSTEM_PROMPT = "You are a world-class market research analyst with REAL-TIME web search. You must use your search capabilities to gather current data and provide a comprehensive, data-driven analysis with actionable insights. Cite your sources."
+
+class InnovationMarketResearcher:
+    def __init__(self, api_key: Optional[str] = None, max_concurrent_requests: int = 8):
+        """
+        Initialize the Innovation Market Researcher with REAL web search
+        
+        Args:
+            api_key: Groq API key (if not provided, will use GROQ_API_KEY env var)
+            max_concurrent_requests: Maximum number of Groq requests in flight at once
+        """
+        self.api_key = resolve_api_key(api_key)
+        self._semaphore = LoopSemaphore(max_concurrent_requests)
+        self.model = "groq/compound"
+
+    @property
+    def client(self) -> AsyncGroq:
+        """Client shared with every other researcher on the running event loop"""
+        return get_async_client(self.api_key)
+        
+    @staticmethod
+    def get_web_search_prompt(user_idea: str) -> str:
+        """
+        Generate a prompt that runs every required web search and returns structured JSON.
+        """
+        searches = "\n".join(
+            f'- "{field}": search for "{query.format(user_idea=user_idea)}"' for field, query in REQUIRED_WEB_SEARCHES
+        )
+        return _WEB_SEARCH_PROMPT_TPL.substitute(searches=searches)
+
+    @staticmethod
+    def format_search_findings(findings: Dict[str, Any]) -> str:
+        """
+        Render the structured search findings as markdown sections for the analysis prompt.
+        """
+        sections = []
+        for field, _ in REQUIRED_WEB_SEARCHES:
+            value = findings.get(field)
+            if not value:
+                continue
+            if isinstance(value, list):
+                value = "\n".join(f"- {item}" for item in value)
+            sections.append(f"### {field.replace('_', ' ').title()}\n{value}")
+        return "\n\n".join(sections)
 
-    async def analyze_market_opportunity(self, user_idea: str) -> Dict[str, Any]:
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def get_universal_market_research_prompt(user_idea: str, search_findings: str) -> str:
+        """
+        Generate a concise but comprehensive prompt for market research analysis.
+        """
+        return _MARKET_RESEARCH_PROMPT_TPL.substitute(user_idea=user_idea, search_findings=search_findings)
+
+    async def analyze_market_opportunity(self, user_idea: str, on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
         """
         Perform comprehensive market research analysis using REAL web search.
         Includes robust error handling for rate limits and request size issues.
+        The report is streamed to on_token as it is generated.
         """
-        research_prompt = self.get_universal_market_research_prompt(user_idea)
         max_retries = 3
-        retry_delay = 61  # 61 seconds for minute-based TPM limits
 
-        for attempt in range(max_retries):
-            try:
-                completion = self.client.chat.completions.create(
+        async def request() -> Dict[str, Any]:
+            async with self._semaphore:
+                completion = await self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": "You are a world-class market research analyst with REAL-TIME web search. You must use your search capabilities to gather current data and provide a comprehensive, data-driven analysis with actionable insights. Cite your sources."
-                        },
-                        {
-                            "role": "user", 
-                            "content": research_prompt
-                        }
-                    ],
+                    messages=messages,
                     temperature=0.7,
                     max_tokens=8000,
                     top_p=0.9,
-                    stream=False
+                    stream=True
                 )
-                
-                analysis_result = completion.choices[0].message.content
-                
-                web_search_data = getattr(completion.choices[0].message, 'executed_tools', [])
-                reasoning_data = getattr(completion.choices[0].message, 'reasoning', "")
-                
-                return {
-                    "user_idea": user_idea,
-                    "analysis_timestamp": datetime.now().isoformat(),
-                    "model_used": self.model,
-                    "market_research_analysis": analysis_result,
-                    "web_search_data": web_search_data,
-                    "reasoning_process": reasoning_data,
-                    "analysis_metadata": {
-                        "total_tokens": completion.usage.total_tokens if hasattr(completion, 'usage') else None,
-                        "analysis_depth": "comprehensive_with_real_web_search",
-                        "web_searches_performed": len(web_search_data) if web_search_data else 0
-                    }
-                }
-            
-            except RateLimitError as e:
-                if attempt < max_retries - 1:
-                    print(f"⚠️ Rate limit reached. Retrying in {retry_delay} seconds... (Attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    error_message = f"Analysis failed after {max_retries} attempts due to persistent rate limiting."
-                    print(f"❌ {error_message}")
-                    return {"error": error_message, "details": str(e)}
-            except Exception as e:
-                error_message = f"An unexpected error occurred during analysis: {e}"
-                print(f"❌ {error_message}")
-                return {"error": error_message}
+                return await acollect_stream(completion, on_token)
+
+        try:
+            findings, search_tools, search_tokens = await self._web_search(user_idea, max_retries)
+            research_prompt = self.get_universal_market_research_prompt(user_idea, self.format_search_findings(findings))
+            # Built once and reused by every retry attempt
+            messages = [
+                {"role": "system", "content": _MARKET_RESEARCH_SYSTEM_PROMPT},
+                {"role": "user", "content": research_prompt}
+            ]
+
+            streamed = await retry_async(request, max_retries)
+        except RateLimitError as e:
+            error_message = f"Analysis failed after {max_retries} attempts due to persistent rate limiting."
+            print(f"❌ {error_message}")
+            return {"error": error_message, "details": str(e)}
+        except Exception as e:
+            error_message = f"An unexpected error occurred during analysis: {e}"
+            print(f"❌ {error_message}")
+            return {"error": error_message}
+
+        analysis_result = streamed["content"]
+        
+        web_search_data = search_tools + streamed["executed_tools"]
+        reasoning_data = streamed["reasoning"]
+        usage = streamed["usage"]
+        total_tokens = (search_tokens or 0) + (usage.total_tokens if usage else 0)
         
-        return {"error": "Analysis failed after all retries."}
+        return {
+            "user_idea": user_idea,
+            "analysis_timestamp": datetime.now().isoformat(),
+            "model_used": self.model,
+            "market_research_analysis": analysis_result,
+            "web_search_data": web_search_data,
+            "search_findings": findings,
+            "reasoning_process": reasoning_data,
+            "analysis_metadata": {
+                "total_tokens": total_tokens or None,
+                "analysis_depth": "comprehensive_with_real_web_search",
+                "web_searches_performed": len(web_search_data) if web_search_data else 0
+            }
+        }
+
+    async def _web_search(self, user_idea: str, max_retries: int = 3):
+        """
+        Run all required web searches in one structured call and return (findings, executed_tools, total_tokens).
+        """
+        messages = [{"role": "user", "content": self.get_web_search_prompt(user_idea)}]
+
+        async def request():
+            async with self._semaphore:
+                return await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.6,
+                    max_tokens=3000,
+                    response_format={"type": "json_object"},
+                    stream=False
+                )
+
+        completion = await retry_async(request, max_retries)
+        message = completion.choices[0].message
+        try:
+            findings = orjson.loads(message.content or "{}")
+        except orjson.JSONDecodeError:
+            # Keep the raw answer rather than losing the search results entirely
+            findings = {"market_size": message.content}
+        if not isinstance(findings, dict):
+            findings = {"market_size": message.content}
+        return (
+            findings,
+            getattr(message, 'executed_tools', None) or [],
+            completion.usage.total_tokens if completion.usage else None,
+        )
 
 
     def save_analysis_report(self, analysis_result: Dict[str, Any], filename: Optional[str] = None) -> str:
@@ -133,46 +215,42 @@ Begin your comprehensive market research now:"""
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"market_research_analysis_{timestamp}.md"
         
-        web_searches_info = ""
+        metadata = analysis_result.get('analysis_metadata', {})
+        # Written chunk by chunk so the multi-KB analysis is never copied into one big report string
+        chunks = [
+            "# Market Research Analysis Report\n\n",
+            f"**Idea Analyzed**: {analysis_result.get('user_idea', 'N/A')}\n",
+            f"**Analysis Date**: {analysis_result.get('analysis_timestamp', 'N/A')}\n",
+            f"**AI Model**: {analysis_result.get('model_used', 'N/A')}\n\n---\n\n",
+            analysis_result.get('market_research_analysis', 'Analysis not available'),
+            "\n\n---\n",
+        ]
         if analysis_result.get('web_search_data'):
-            web_searches_info = f"""
-## Web Search Information
-- **Web Searches Performed**: {analysis_result.get('analysis_metadata', {}).get('web_searches_performed', 'N/A')}
-"""
+            chunks.append(
+                f"\n## Web Search Information\n- **Web Searches Performed**: {metadata.get('web_searches_performed', 'N/A')}\n"
+            )
+        chunks.append(f"\n## Analysis Metadata\n- **Total Tokens Used**: {metadata.get('total_tokens', 'N/A')}\n")
+        chunks.append("---\n*Generated by Innovation Agent - Market Research Tool*\n")
         
-        report_content = f"""# Market Research Analysis Report
-
-**Idea Analyzed**: {analysis_result.get('user_idea', 'N/A')}
-**Analysis Date**: {analysis_result.get('analysis_timestamp', 'N/A')}
-**AI Model**: {analysis_result.get('model_used', 'N/A')}
-
----
+        with open(filename, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+            f.writelines(chunks)
 
-{analysis_result.get('market_research_analysis', 'Analysis not available')}
-
----
-{web_searches_info}
-## Analysis Metadata
-- **Total Tokens Used**: {analysis_result.get('analysis_metadata', {}).get('total_tokens', 'N/A')}
----
-*Generated by Innovation Agent - Market Research Tool*
-"""
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        # Keep the full structured result next to the report so it can be replayed without the API
+        with open(os.path.splitext(filename)[0] + ".json", 'wb') as f:
+            f.write(to_json_bytes(analysis_result))
         
         return filename
 
 async def main():
     researcher = InnovationMarketResearcher()
-    user_idea = input("✍️ Enter your idea for market research analysis: ")
+    user_idea = await ainput("✍️ Enter your idea for market research analysis: ")
     
     print("\n🚀 Starting comprehensive market research analysis...")
     print(f"💡 Analyzing idea: {user_idea}")
     print("🔍 Using Groq Compound System with built-in web search")
     print("=" * 80)
     
-    analysis_result = await researcher.analyze_market_opportunity(user_idea)
+    analysis_result = await researcher.analyze_market_opportunity(user_idea, on_token=print_token)
     
     if "error" in analysis_result:
         print(f"❌ Error: {analysis_result['error']}")
@@ -180,9 +258,8 @@ async def main():
             print(f"   Details: {analysis_result['details']}")
         return
     
-    print("\n📊 MARKET RESEARCH ANALYSIS COMPLETE")
+    print("\n\n📊 MARKET RESEARCH ANALYSIS COMPLETE")
     print("=" * 80)
-    print(analysis_result["market_research_analysis"])
     
     if analysis_result.get("web_search_data"):
         print(f"\n🌐 Web searches performed: {analysis_result['analysis_metadata']['web_searches_performed']}")
@@ -191,5 +268,8 @@ async def main():
     print(f"\n💾 Analysis saved to: {saved_file}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        run(main())
+    except KeyboardInterrupt:
+        print("\nExiting.")
 
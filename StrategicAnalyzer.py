@@ -10,47 +10,22 @@ This tool analyzes market research and execution plans to provide:
 """
 
 import os
-import json
+import sys
 import asyncio
+import string
+import pathlib
 from datetime import datetime
-from groq import Groq, RateLimitError
-from typing import Dict, Any, Optional
+from groq import AsyncGroq, RateLimitError
+from typing import Dict, Any, List, Optional, Tuple
+from GroqUtils import (ResponseCache, acollect_stream, ainput, close_async_client, get_async_client, print_token,
+                       rate_limit_pause, resolve_api_key, retry_async, run, TokenCallback, to_json_bytes,
+                       to_daemon_thread, truncate_tokens, LoopSemaphore)
 
-class StrategicAnalyzer:
-    def __init__(self, api_key: Optional[str] = None):
-        """
-        Initialize the Strategic Analyzer
-        
-        Args:
-            api_key: Groq API key (if not provided, will use GROQ_API_KEY env var)
-        """
-        self.client = Groq(
-            api_key=api_key or "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"
-        )
-        self.model = "openai/gpt-oss-120b"
-        
-    def get_strategic_analysis_prompt(self, user_idea: str, market_report: str, execution_plan: str) -> str:
-        """
-        Generate comprehensive strategic analysis prompt
-        
-        Args:
-            user_idea: The business idea
-            market_report: Market research analysis
-            execution_plan: Step-by-step execution plan
-            
-        Returns:
-            Formatted prompt for strategic analysis
-        """
-        
-        prompt = f"""You are a world-class business strategist and competitive intelligence expert with 30+ years of experience analyzing business opportunities and creating differentiation strategies. Your task is to conduct a comprehensive strategic analysis of this business idea.
-
-**BUSINESS IDEA**: {user_idea}
-
-**MARKET RESEARCH CONTEXT**:
-{market_report[:2500]}
+_STRATEGY_SYSTEM_PROMPT = "You are a world-class business strategist and competitive intelligence expert. Provide comprehensive strategic analysis with specific, actionable recommendations for competitive advantage and differentiation. Be detailed, analytical, and practical in your recommendations."
 
-**EXECUTION PLAN CONTEXT**:
-{execution_plan[:2500]}
+# Static part of the strategic analysis prompt. It is kept ahead of the per-idea context so
+# consecutive requests share an identical prefix that the provider can serve from its prompt cache
+_STRATEGIC_PROMPT_PREFIX = """You are a world-class business strategist and competitive intelligence expert with 30+ years of experience analyzing business opportunities and creating differentiation strategies. Your task is to conduct a comprehensive strategic analysis of the business idea described at the end of this prompt.
 
 **STRATEGIC ANALYSIS FRAMEWORK**:
 Analyze this business opportunity through multiple strategic lenses and provide actionable insights for competitive advantage.
@@ -309,25 +284,140 @@ Analyze this business opportunity through multiple strategic lenses and provide
 - Address both offensive (growth) and defensive (protection) strategies
 - Balance innovation with execution practicality
 - Consider different scenarios (optimistic, realistic, pessimistic)
+- End your response with the exact string ---END---
+"""
+
+# Headings whose presence means an analysis already covers a full SWOT
+SWOT_KEYWORDS = ("STRENGTH", "WEAKNESS", "OPPORTUNIT", "THREAT")
+
+# Sentinel the analysis prompt asks the model to finish with; generation stops on it
+ANALYSIS_END_MARKER = "---END---"
+
+# Tokens of each input report included as prompt context
+REPORT_CONTEXT_TOKENS = 600
+# Report files larger than this are rejected before being read
+MAX_REPORT_FILE_BYTES = 1024 * 1024
+
+# Compiled once at import; only the per-idea context at the end is substituted per call
+_STRATEGIC_PROMPT_TPL = string.Template(_STRATEGIC_PROMPT_PREFIX + """
+**BUSINESS IDEA**: $user_idea
+
+**MARKET RESEARCH CONTEXT**:
+$market_report
+
+**EXECUTION PLAN CONTEXT**:
+$execution_plan
+
+Begin your comprehensive strategic analysis now:""")
+
+# Fixed header and footer of the saved report; the long analysis text is written between them as-is
+_REPORT_HEADER_TPL = string.Template("""# Strategic Analysis & Differentiation Report
+
+**Business Idea**: $user_idea
+**Analysis Date**: $analysis_timestamp
+**AI Model**: $model_used
+**Analysis Type**: $analysis_type
+
+---
 
-Begin your comprehensive strategic analysis now:"""
+## Input Context Summary
+
+### Market Research Summary
+""")
+
+_REPORT_FOOTER_TPL = string.Template("""
+
+---
 
-        return prompt
+## Analysis Metadata
+- **Total Tokens Used**: $total_tokens
+- **Analysis Depth**: $analysis_depth
+- **Analysis Framework**: $analysis_framework
+
+---
+*Generated by Innovation Agent - Strategic Analysis & Differentiation Tool*
+*Comprehensive Business Strategy and Competitive Intelligence Analysis*
+""")
 
-    async def analyze_strategy(self, user_idea: str = None, market_report: str = None, execution_plan: str = None) -> Dict[str, Any]:
+class StrategicAnalyzer:
+    def __init__(self, api_key: Optional[str] = None, max_concurrent_requests: int = 16,
+                 cache: Optional[ResponseCache] = None):
         """
-        Perform comprehensive strategic analysis
+        Initialize the Strategic Analyzer
         
         Args:
-            user_idea: The business idea (if None, will prompt user)
-            market_report: Market research analysis (if None, will prompt user)
-            execution_plan: Execution plan (if None, will prompt user)
+            api_key: Groq API key (if not provided, will use GROQ_API_KEY env var)
+            max_concurrent_requests: Maximum number of Groq requests in flight at once
+            cache: Response cache shared with other analyzers (a default one is created if omitted)
+        """
+        self.api_key = resolve_api_key(api_key)
+        # Caps in-flight Groq requests when a batch of ideas fans out
+        self._semaphore = LoopSemaphore(max_concurrent_requests)
+        self.cache = cache or ResponseCache()
+        self.model = "openai/gpt-oss-120b"
+
+    @property
+    def client(self) -> AsyncGroq:
+        """Client shared with the other analyzers on the running event loop"""
+        return get_async_client(self.api_key)
+
+    async def aclose(self) -> None:
+        """Close the shared client and its keep-alive connections for the running event loop"""
+        await close_async_client(self.api_key)
+
+    async def __aenter__(self) -> "StrategicAnalyzer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+        
+    def get_strategic_analysis_prompt(self, user_idea: str, market_report: str, execution_plan: str) -> str:
+        """
+        Generate comprehensive strategic analysis prompt
+        
+        Args:
+            user_idea: The business idea
+            market_report: Market research analysis
+            execution_plan: Step-by-step execution plan
             
         Returns:
-            Comprehensive strategic analysis results
+            Formatted prompt for strategic analysis
         """
         
-        # Get inputs from user if not provided
+        return _STRATEGIC_PROMPT_TPL.substitute(
+            user_idea=user_idea,
+            market_report=truncate_tokens(market_report, REPORT_CONTEXT_TOKENS),
+            execution_plan=truncate_tokens(execution_plan, REPORT_CONTEXT_TOKENS),
+        )
+
+    @staticmethod
+    def _read_multiline(prompt: str) -> str:
+        """
+        Read a pasted multi-line report from stdin in one call, up to end of input
+        """
+        print(prompt)
+        return sys.stdin.read().strip()
+
+    @staticmethod
+    def _read_report_file(file_path: str, fallback: str) -> str:
+        """
+        Read a report file in one shot, returning fallback if it is missing or too large
+        """
+        try:
+            size = os.path.getsize(file_path)
+            if size > MAX_REPORT_FILE_BYTES:
+                print(f"Error reading file: {file_path} is {size} bytes (limit {MAX_REPORT_FILE_BYTES})")
+                return fallback
+            return pathlib.Path(file_path).read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return fallback
+
+    def _collect_inputs(self, user_idea: Optional[str], market_report: Optional[str],
+                        execution_plan: Optional[str]) -> Tuple[str, str, str]:
+        """
+        Interactively ask for whichever analysis inputs were not provided
+        """
         if not user_idea:
             user_idea = input("✍️ Enter your business idea: ")
         
@@ -338,22 +428,12 @@ Begin your comprehensive strategic analysis now:"""
             choice = input("Choose option (1/2): ").strip()
             
             if choice == "1":
-                print("Paste your market research report (press Enter twice when done):")
-                lines = []
-                while True:
-                    line = input()
-                    if line == "":
-                        break
-                    lines.append(line)
-                market_report = "\n".join(lines)
+                market_report = self._read_multiline(
+                    "Paste your market research report (finish with Ctrl-D on a new line, Ctrl-Z then Enter on Windows):"
+                )
             else:
                 file_path = input("Enter path to market research file: ")
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        market_report = f.read()
-                except Exception as e:
-                    print(f"Error reading file: {e}")
-                    market_report = "Market research not available"
+                market_report = self._read_report_file(file_path, "Market research not available")
         
         if not execution_plan:
             print("\n📋 Please provide execution plan:")
@@ -362,86 +442,137 @@ Begin your comprehensive strategic analysis now:"""
             choice = input("Choose option (1/2): ").strip()
             
             if choice == "1":
-                print("Paste your execution plan (press Enter twice when done):")
-                lines = []
-                while True:
-                    line = input()
-                    if line == "":
-                        break
-                    lines.append(line)
-                execution_plan = "\n".join(lines)
+                execution_plan = self._read_multiline(
+                    "Paste your execution plan (finish with Ctrl-D on a new line, Ctrl-Z then Enter on Windows):"
+                )
             else:
                 file_path = input("Enter path to execution plan file: ")
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        execution_plan = f.read()
-                except Exception as e:
-                    print(f"Error reading file: {e}")
-                    execution_plan = "Execution plan not available"
+                execution_plan = self._read_report_file(file_path, "Execution plan not available")
+
+        return user_idea, market_report, execution_plan
+
+    async def analyze_strategy(self, user_idea: str = None, market_report: str = None, execution_plan: str = None,
+                               on_token: Optional[TokenCallback] = None, use_cache: bool = True,
+                               max_tokens: int = 4500, stop: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Perform comprehensive strategic analysis
+        
+        Args:
+            user_idea: The business idea (if None, will prompt user)
+            market_report: Market research analysis (if None, will prompt user)
+            execution_plan: Execution plan (if None, will prompt user)
+            on_token: Optional callback receiving the analysis as it streams in
+            use_cache: Reuse and store the response in the on-disk response cache
+            max_tokens: Upper bound on generated tokens
+            stop: Extra stop sequences, in addition to the end marker the prompt requests
+            
+        Returns:
+            Comprehensive strategic analysis results
+        """
+        
+        # Prompt from a worker thread so concurrent requests keep running while the user types
+        user_idea, market_report, execution_plan = await to_daemon_thread(
+            self._collect_inputs, user_idea, market_report, execution_plan
+        )
         
         print(f"\n🎯 Conducting strategic analysis for: {user_idea[:100]}...")
         print("=" * 80)
         
         analysis_prompt = self.get_strategic_analysis_prompt(user_idea, market_report, execution_plan)
         max_retries = 3
-        retry_delay = 61  # Wait 61 seconds
-
-        for attempt in range(max_retries):
-            try:
-                print("🧠 Analyzing positives, negatives, and differentiation strategies...")
-                
-                completion = self.client.chat.completions.create(
+        # Built once and reused by every retry attempt
+        messages = [
+            {"role": "system", "content": _STRATEGY_SYSTEM_PROMPT},
+            {"role": "user", "content": analysis_prompt}
+        ]
+        params = {
+            "temperature": 0.8, "max_tokens": max_tokens, "top_p": 0.9,
+            "stop": [ANALYSIS_END_MARKER, *(stop or [])],
+        }
+        cache_key = ResponseCache.make_key(self.model, messages, **params)
+
+        async def request() -> Dict[str, Any]:
+            # Slow down batch submissions while the API keeps rate limiting; paused
+            # before taking a slot so a sleeping request never holds one
+            await rate_limit_pause()
+            async with self._semaphore:
+                completion = await self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": "You are a world-class business strategist and competitive intelligence expert. Provide comprehensive strategic analysis with specific, actionable recommendations for competitive advantage and differentiation. Be detailed, analytical, and practical in your recommendations."
-                        },
-                        {
-                            "role": "user", 
-                            "content": analysis_prompt
-                        }
-                    ],
-                    temperature=0.8,
-                    max_tokens=8000,
-                    top_p=0.9,
-                    stream=False
+                    messages=messages,
+                    stream=True,
+                    **params
                 )
-                
-                strategic_analysis = completion.choices[0].message.content
-                
-                return {
-                    "user_idea": user_idea,
-                    "market_report_summary": market_report[:500] + "..." if len(market_report) > 500 else market_report,
-                    "execution_plan_summary": execution_plan[:500] + "..." if len(execution_plan) > 500 else execution_plan,
-                    "strategic_analysis": strategic_analysis,
-                    "analysis_timestamp": datetime.now().isoformat(),
-                    "model_used": self.model,
-                    "analysis_type": "comprehensive_strategic_analysis",
-                    "analysis_metadata": {
-                        "total_tokens": completion.usage.total_tokens if hasattr(completion, 'usage') else None,
-                        "analysis_depth": "comprehensive_strategic_differentiation",
-                        "analysis_framework": "positive_negative_differentiation_analysis"
-                    }
-                }
+                return await acollect_stream(completion, on_token)
+
+        try:
+            print("🧠 Analyzing positives, negatives, and differentiation strategies...")
+            
+            strategic_analysis = self.cache.get(cache_key) if use_cache else None
+            usage = None
+            if strategic_analysis is not None:
+                if on_token:
+                    on_token(strategic_analysis)
+            else:
+                streamed = await retry_async(request, max_retries, cap=60.0)
+                strategic_analysis = streamed["content"]
+                usage = streamed["usage"]
+                if use_cache:
+                    self.cache.set(cache_key, strategic_analysis)
             
-            except RateLimitError as e:
-                if attempt < max_retries - 1:
-                    print(f"⚠️ Rate limit reached. Retrying in {retry_delay} seconds... (Attempt {attempt + 1}/{max_retries})")
-                    await asyncio.sleep(retry_delay)
-                else:
-                    print(f"❌ Strategic analysis failed after {max_retries} attempts due to persistent rate limiting.")
-                    return {
-                        "error": f"Strategic analysis failed after multiple retries: {str(e)}",
-                        "user_idea": user_idea,
-                        "timestamp": datetime.now().isoformat()
-                    }
-            except Exception as e:
-                return {
-                    "error": f"Strategic analysis failed: {str(e)}",
-                    "user_idea": user_idea,
-                    "timestamp": datetime.now().isoformat()
+            return {
+                "user_idea": user_idea,
+                "market_report_summary": market_report[:500] + "..." if len(market_report) > 500 else market_report,
+                "execution_plan_summary": execution_plan[:500] + "..." if len(execution_plan) > 500 else execution_plan,
+                "strategic_analysis": strategic_analysis,
+                "analysis_timestamp": datetime.now().isoformat(),
+                "model_used": self.model,
+                "analysis_type": "comprehensive_strategic_analysis",
+                "analysis_metadata": {
+                    "total_tokens": usage.total_tokens if usage else None,
+                    "analysis_depth": "comprehensive_strategic_differentiation",
+                    "analysis_framework": "positive_negative_differentiation_analysis"
                 }
+            }
+        
+        except RateLimitError as e:
+            print(f"❌ Strategic analysis failed after {max_retries} attempts due to persistent rate limiting.")
+            return {
+                "error": f"Strategic analysis failed after multiple retries: {str(e)}",
+                "user_idea": user_idea,
+                "timestamp": datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                "error": f"Strategic analysis failed: {str(e)}",
+                "user_idea": user_idea,
+                "timestamp": datetime.now().isoformat()
+            }
+
+    async def analyze_strategy_batch(self, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Perform strategic analysis for a portfolio of ideas concurrently
+        
+        Args:
+            items: Dicts with non-empty user_idea, market_report and execution_plan
+                   values (a batch never prompts for missing inputs)
+            
+        Returns:
+            One analysis result per item, in the same order; failures are
+            reported as error results rather than raised
+            
+        Raises:
+            ValueError: If an item is missing an input or has an empty one
+        """
+        fields = ("user_idea", "market_report", "execution_plan")
+        for index, item in enumerate(items):
+            missing = [field for field in fields if not item.get(field)]
+            if missing:
+                raise ValueError(f"Batch item {index} is missing {', '.join(missing)}")
+        
+        return list(await asyncio.gather(*(
+            self.analyze_strategy(item["user_idea"], item["market_report"], item["execution_plan"])
+            for item in items
+        )))
 
     def save_strategic_analysis(self, analysis_result: Dict[str, Any], filename: Optional[str] = None) -> str:
         """
@@ -458,53 +589,64 @@ Begin your comprehensive strategic analysis now:"""
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"strategic_analysis_{timestamp}.md"
         
-        # Format as comprehensive markdown report
-        report_content = f"""# Strategic Analysis & Differentiation Report
-
-**Business Idea**: {analysis_result.get('user_idea', 'N/A')}
-**Analysis Date**: {analysis_result.get('analysis_timestamp', 'N/A')}
-**AI Model**: {analysis_result.get('model_used', 'N/A')}
-**Analysis Type**: {analysis_result.get('analysis_type', 'N/A')}
-
----
-
-## Input Context Summary
-
-### Market Research Summary
-{analysis_result.get('market_report_summary', 'Not available')}
-
-### Execution Plan Summary  
-{analysis_result.get('execution_plan_summary', 'Not available')}
-
----
-
-# COMPREHENSIVE STRATEGIC ANALYSIS
-
-{analysis_result.get('strategic_analysis', 'Strategic analysis not available')}
-
----
-
-## Analysis Metadata
-- **Total Tokens Used**: {analysis_result.get('analysis_metadata', {}).get('total_tokens', 'N/A')}
-- **Analysis Depth**: {analysis_result.get('analysis_metadata', {}).get('analysis_depth', 'N/A')}
-- **Analysis Framework**: {analysis_result.get('analysis_metadata', {}).get('analysis_framework', 'N/A')}
-
----
-*Generated by Innovation Agent - Strategic Analysis & Differentiation Tool*
-*Comprehensive Business Strategy and Competitive Intelligence Analysis*
-"""
+        metadata = analysis_result.get('analysis_metadata', {})
+        # Written chunk by chunk so the multi-KB analysis is never copied into one big report string
+        chunks = [
+            _REPORT_HEADER_TPL.substitute(
+                user_idea=analysis_result.get('user_idea', 'N/A'),
+                analysis_timestamp=analysis_result.get('analysis_timestamp', 'N/A'),
+                model_used=analysis_result.get('model_used', 'N/A'),
+                analysis_type=analysis_result.get('analysis_type', 'N/A'),
+            ),
+            analysis_result.get('market_report_summary', 'Not available'),
+            "\n\n### Execution Plan Summary  \n",
+            analysis_result.get('execution_plan_summary', 'Not available'),
+            "\n\n---\n\n# COMPREHENSIVE STRATEGIC ANALYSIS\n\n",
+            analysis_result.get('strategic_analysis', 'Strategic analysis not available'),
+            _REPORT_FOOTER_TPL.substitute(
+                total_tokens=metadata.get('total_tokens', 'N/A'),
+                analysis_depth=metadata.get('analysis_depth', 'N/A'),
+                analysis_framework=metadata.get('analysis_framework', 'N/A'),
+            ),
+        ]
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        with open(filename, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+            f.writelines(chunks)
+
+        # Keep the full structured result next to the report so it can be replayed without the API
+        with open(os.path.splitext(filename)[0] + ".json", 'wb') as f:
+            f.write(to_json_bytes(analysis_result))
         
         return filename
 
-    async def quick_swot_analysis(self, user_idea: str) -> str:
+    async def save_strategic_analysis_async(self, analysis_result: Dict[str, Any], filename: Optional[str] = None) -> str:
+        """
+        Save strategic analysis results from a worker thread, keeping the event loop free
+        
+        Args:
+            analysis_result: The strategic analysis results
+            filename: Optional custom filename
+            
+        Returns:
+            Path to saved file
+        """
+        return await asyncio.to_thread(self.save_strategic_analysis, analysis_result, filename)
+
+    @staticmethod
+    def covers_swot(strategic_analysis: str) -> bool:
+        """
+        Whether an analysis already discusses all four SWOT quadrants
+        """
+        text = strategic_analysis.upper()
+        return all(keyword in text for keyword in SWOT_KEYWORDS)
+
+    async def quick_swot_analysis(self, user_idea: str, use_cache: bool = True) -> str:
         """
         Quick SWOT analysis for rapid strategic insights
         
         Args:
             user_idea: The business idea
+            use_cache: Reuse and store the response in the on-disk response cache
             
         Returns:
             SWOT analysis summary
@@ -527,17 +669,26 @@ Begin your comprehensive strategic analysis now:"""
 For each factor, provide brief explanation and strategic implication.
 Keep concise but actionable (under 1000 words)."""
 
+        messages = [{"role": "user", "content": swot_prompt}]
+        params = {"temperature": 0.7, "max_tokens": 1500}
+        cache_key = ResponseCache.make_key(self.model, messages, **params)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": swot_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1500
-            )
+            async with self._semaphore:
+                completion = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    **params
+                )
             
-            return completion.choices[0].message.content
+            swot_analysis = completion.choices[0].message.content
+            if use_cache:
+                self.cache.set(cache_key, swot_analysis)
+            return swot_analysis
             
         except Exception as e:
             return f"SWOT analysis failed: {str(e)}"
@@ -550,53 +701,56 @@ async def main():
     """
     
     # Initialize the analyzer
-    analyzer = StrategicAnalyzer()
-    
-    print("🎯 INNOVATION AGENT - STRATEGIC ANALYSIS & DIFFERENTIATION")
-    print("=" * 70)
-    print("This tool analyzes your business idea and provides:")
-    print("✅ Comprehensive positive factors and opportunities")
-    print("⚠️ Critical negative factors and risks")
-    print("🚀 Strategic modifications for competitive advantage")
-    print("🏆 Differentiation strategies to stand out")
-    print("=" * 70)
+    async with StrategicAnalyzer() as analyzer:
+        
+        print("🎯 INNOVATION AGENT - STRATEGIC ANALYSIS & DIFFERENTIATION")
+        print("=" * 70)
+        print("This tool analyzes your business idea and provides:")
+        print("✅ Comprehensive positive factors and opportunities")
+        print("⚠️ Critical negative factors and risks")
+        print("🚀 Strategic modifications for competitive advantage")
+        print("🏆 Differentiation strategies to stand out")
+        print("=" * 70)
     
-    choice = input("\nChoose analysis type:\n1. Full strategic analysis (comprehensive)\n2. Quick SWOT analysis\nChoice (1/2): ").strip()
+        choice = (await ainput("\nChoose analysis type:\n1. Full strategic analysis (comprehensive)\n2. Quick SWOT analysis\nChoice (1/2): ")).strip()
     
-    if choice == "2":
-        # Quick SWOT analysis
-        user_idea = input("✍️ Enter your business idea: ")
-        print("\n⚡ Generating SWOT analysis...")
+        if choice == "2":
+            # Quick SWOT analysis
+            user_idea = await ainput("✍️ Enter your business idea: ")
+            print("\n⚡ Generating SWOT analysis...")
         
-        swot_analysis = await analyzer.quick_swot_analysis(user_idea)
-        print("\n📊 SWOT ANALYSIS")
-        print("=" * 50)
-        print(swot_analysis)
+            swot_analysis = await analyzer.quick_swot_analysis(user_idea)
+            print("\n📊 SWOT ANALYSIS")
+            print("=" * 50)
+            print(swot_analysis)
         
-    else:
-        # Full strategic analysis
-        analysis_result = await analyzer.analyze_strategy()
+        else:
+            # Full strategic analysis
+            user_idea = await ainput("✍️ Enter your business idea: ")
+            analysis_result = await analyzer.analyze_strategy(user_idea, on_token=print_token)
         
-        if "error" in analysis_result:
-            print(f"❌ Error: {analysis_result['error']}")
-            return
+            if "error" in analysis_result:
+                print(f"❌ Error: {analysis_result['error']}")
+                return
         
-        # Display results
-        print("\n🎯 STRATEGIC ANALYSIS COMPLETE")
-        print("=" * 80)
-        print(analysis_result["strategic_analysis"])
+            # The analysis was already streamed to the terminal as it was generated
+            print("\n\n🎯 STRATEGIC ANALYSIS COMPLETE")
+            print("=" * 80)
         
-        # Save to file
-        saved_file = analyzer.save_strategic_analysis(analysis_result)
-        print(f"\n💾 Strategic analysis saved to: {saved_file}")
+            # Save to file
+            saved_file = await analyzer.save_strategic_analysis_async(analysis_result)
+            print(f"\n💾 Strategic analysis saved to: {saved_file}")
         
-        # Generate quick SWOT as bonus
-        print("\n📊 BONUS: QUICK SWOT ANALYSIS")
-        print("=" * 40)
-        swot_analysis = await analyzer.quick_swot_analysis(analysis_result["user_idea"])
-        print(swot_analysis)
+            # The bonus SWOT is only requested when the full analysis misses a quadrant
+            if not analyzer.covers_swot(analysis_result["strategic_analysis"]):
+                print("\n📊 BONUS: QUICK SWOT ANALYSIS")
+                print("=" * 40)
+                print(await analyzer.quick_swot_analysis(user_idea))
 
 
 if __name__ == "__main__":
     # Run the strategic analyzer
-    asyncio.run(main())
+    try:
+        run(main())
+    except KeyboardInterrupt:
+        print("\nExiting.")
@@ -7,17 +7,28 @@ A comprehensive business innovation analysis platform
 import streamlit as st
 import asyncio
 import os
-import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Dict, Any, Optional, Awaitable, Callable, Tuple, TypeVar
 import time
 import re
+import hashlib
+import itertools
+import threading
+import functools
+from concurrent.futures import CancelledError, Future, wait
+from streamlit.runtime.scriptrunner import StopException
 
-# Import the Innovation Agent modules
-from MarketResearchAnalysis import InnovationMarketResearcher
-from ExecutionPlanGenerator import ExecutionPlanGenerator
-from StrategicAnalyzer import StrategicAnalyzer
-from groq import Groq
+T = TypeVar("T")
+
+# The Innovation Agent modules pull in groq, httpx and pydantic, so they are imported
+# on first use by the cached getters below rather than at startup
+if TYPE_CHECKING:
+    from MarketResearchAnalysis import InnovationMarketResearcher
+    from ExecutionPlanGenerator import ExecutionPlanGenerator
+    from StrategicAnalyzer import StrategicAnalyzer
+    from GroqUtils import ResponseCache, TokenCallback
+    from groq import Groq
 
 # Configure Streamlit page
 st.set_page_config(
@@ -28,7 +39,7 @@ st.set_page_config(
 )
 
 # Custom CSS for professional styling
-st.markdown("""
+_CSS = """
 <style>
     /* Main theme colors */
     :root {
@@ -185,27 +196,54 @@ st.markdown("""
         to { transform: rotate(360deg); }
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def page_css() -> str:
+    """_CSS without comments and indentation, computed once per process"""
+    css = re.sub(r'/\*.*?\*/', '', _CSS, flags=re.DOTALL)
+    return re.sub(r'\s*\n\s*', '', css)
+
+# Streamlit drops any element a rerun does not emit again, so the styles are sent on every
+# run; only the minification is cached
+st.markdown(page_css(), unsafe_allow_html=True)
 
 # Initialize session state
+# Chat turns kept per session
+CHAT_HISTORY_LENGTH = 20
+
+def analysis_defaults() -> Dict[str, Any]:
+    """Initial per-analysis session state, built fresh each call so sessions never share containers"""
+    return {
+        "current_step": 1,
+        "user_idea": "",
+        "market_research": None,
+        "execution_plan": None,
+        "strategic_analysis": None,
+        "chat_history": deque(maxlen=CHAT_HISTORY_LENGTH),
+        "report_hashes": {},
+        "processing": False,
+    }
+
 def init_session_state():
     """Initialize session state variables"""
     if 'api_key' not in st.session_state:
         st.session_state.api_key = os.getenv("GROQ_API_KEY", "")
-    if 'current_step' not in st.session_state:
-        st.session_state.current_step = 1
-    if 'user_idea' not in st.session_state:
-        st.session_state.user_idea = ""
-    if 'market_research' not in st.session_state:
-        st.session_state.market_research = None
-    if 'execution_plan' not in st.session_state:
-        st.session_state.execution_plan = None
-    if 'strategic_analysis' not in st.session_state:
-        st.session_state.strategic_analysis = None
-    if 'processing' not in st.session_state:
-        st.session_state.processing = False
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    for key, value in analysis_defaults().items():
+        st.session_state.setdefault(key, value)
+
+# Report text field of each analysis kept in session_state
+REPORT_FIELDS = {
+    "market_research": "market_research_analysis",
+    "execution_plan": "execution_plan",
+    "strategic_analysis": "strategic_analysis",
+}
+
+def store_result(key: str, result: Dict[str, Any]) -> None:
+    """Save a finished analysis along with the digest its derived views are cached under"""
+    st.session_state[key] = result
+    report = result.get(REPORT_FIELDS[key], '')
+    st.session_state.report_hashes[key] = hashlib.blake2b(report.encode('utf-8'), digest_size=8).hexdigest()
 
 # Helper functions
 def display_header():
@@ -237,79 +275,340 @@ def display_progress_indicator():
             else:
                 st.text(f"⭕ {label}")
 
+# A markdown bullet line; the item text is group 1
+_BULLET_RE = re.compile(r'(?m)^[ \t]*[-•*][ \t]+(.+)$')
+
 def extract_key_points(text: str, max_points: int = 5) -> list:
     """Extract key points from text for summary display"""
-    lines = text.split('\n')
-    points = []
-    for line in lines:
-        line = line.strip()
-        if line and (line.startswith('-') or line.startswith('•') or line.startswith('*')):
-            points.append(line.lstrip('-•* '))
-            if len(points) >= max_points:
-                break
-    return points[:max_points] if points else ["Analysis in progress..."]
+    # finditer is lazy, so scanning stops at the last bullet needed
+    matches = itertools.islice(_BULLET_RE.finditer(text), max_points)
+    points = [match.group(1).strip() for match in matches]
+    return points if points else ["Analysis in progress..."]
+
+# Views derived from a report are cached on its digest from store_result; the text itself is
+# left out of the cache key (underscore prefix) so reruns don't rehash multi-KB reports
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_key_points(report_hash: str, _text: str, max_points: int = 5) -> list:
+    return extract_key_points(_text, max_points)
+
+# Markdown stripped from report previews
+_HEADER_RE = re.compile(r'#{1,6}\s')
+_BOLD_RE = re.compile(r'\*{1,2}([^*]+)\*{1,2}')
 
 def format_report_preview(report: str, max_length: int = 500) -> str:
     """Format report for preview display"""
     if not report:
         return "Report not yet generated"
     
-    # Clean up markdown and extract preview
-    preview = re.sub(r'#{1,6}\s', '', report)[:max_length]
-    preview = re.sub(r'\*{1,2}([^*]+)\*{1,2}', r'\1', preview)
+    # Only the head of the report can reach the preview, so clean up markdown on that alone
+    head = report[:max_length * 2]
+    preview = _BOLD_RE.sub(r'\1', _HEADER_RE.sub('', head))[:max_length]
     
     if len(report) > max_length:
         preview += "..."
     
     return preview
 
-async def run_market_research(idea: str, api_key: str) -> Dict[str, Any]:
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_preview(report_hash: str, _report: str, max_length: int = 500) -> str:
+    return format_report_preview(_report, max_length)
+
+# Long-lived clients and analyzers, shared across reruns and sessions instead of rebuilt per click
+# The analyzer getters run on the background loop's thread, where no spinner can be drawn
+@st.cache_resource
+def get_groq(api_key: str) -> "Groq":
+    from groq import Groq
+    return Groq(api_key=api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_researcher(api_key: str) -> "InnovationMarketResearcher":
+    from MarketResearchAnalysis import InnovationMarketResearcher
+    return InnovationMarketResearcher(api_key=api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> "ResponseCache":
+    """One response cache for every stage, so they share its in-memory LRU"""
+    from GroqUtils import ResponseCache
+    return ResponseCache()
+
+@st.cache_resource(show_spinner=False)
+def get_plan_generator(api_key: str) -> "ExecutionPlanGenerator":
+    from ExecutionPlanGenerator import ExecutionPlanGenerator
+    return ExecutionPlanGenerator(api_key=api_key, cache=get_response_cache())
+
+@st.cache_resource(show_spinner=False)
+def get_strategist(api_key: str) -> "StrategicAnalyzer":
+    from StrategicAnalyzer import StrategicAnalyzer
+    return StrategicAnalyzer(api_key=api_key, cache=get_response_cache())
+
+class MarkdownSink:
+    """
+    on_token callback that collects a streamed response for a Streamlit placeholder
+    
+    Tokens arrive on the background loop's thread, where Streamlit elements cannot be
+    updated, so the script thread calls refresh while it waits for the analysis.
+    """
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+        self._parts = []
+        self._rendered = 0
+    
+    def __call__(self, token: str) -> None:
+        self._parts.append(token)
+    
+    def refresh(self) -> None:
+        count = len(self._parts)
+        if count != self._rendered:
+            self.placeholder.markdown("".join(self._parts[:count]))
+            self._rendered = count
+
+@st.cache_resource
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop shared by every analysis, so the Groq connection pools outlive a single click"""
+    from GroqUtils import new_event_loop
+    loop = new_event_loop()
+    threading.Thread(target=loop.run_forever, name="analysis-loop", daemon=True).start()
+    return loop
+
+def run_async(future: Future, sink: Optional[MarkdownSink] = None, interval: float = 0.1):
+    """Block until a background loop future finishes, refreshing sink every interval seconds"""
+    while wait((future,), timeout=interval).not_done:
+        if sink:
+            sink.refresh()
+    if sink:
+        sink.refresh()
+    return future.result()
+
+async def run_market_research(idea: str, api_key: str, on_token: Optional["TokenCallback"] = None) -> Dict[str, Any]:
     """Run market research analysis"""
-    researcher = InnovationMarketResearcher(api_key=api_key)
-    return await researcher.analyze_market_opportunity(idea)
+    researcher = get_researcher(api_key)
+    return await researcher.analyze_market_opportunity(idea, on_token=on_token)
 
-async def run_execution_plan(idea: str, market_report: str, api_key: str) -> Dict[str, Any]:
+async def run_execution_plan(idea: str, market_report: str, api_key: str,
+                             on_token: Optional["TokenCallback"] = None) -> Dict[str, Any]:
     """Generate execution plan"""
-    generator = ExecutionPlanGenerator(api_key=api_key)
-    generator.client.api_key = api_key
+    generator = get_plan_generator(api_key)
+    # Condenses the report once, runs the research tasks concurrently, then plans
+    return await generator.generate_execution_plan(idea, market_report, on_token=on_token)
+
+async def run_strategic_analysis(idea: str, market_report: str, execution_plan: str, api_key: str,
+                                 on_token: Optional["TokenCallback"] = None) -> Dict[str, Any]:
+    """Run strategic analysis"""
+    analyzer = get_strategist(api_key)
+    return await analyzer.analyze_strategy(idea, market_report, execution_plan, on_token=on_token)
+
+async def run_full_analysis(idea: str, api_key: str, on_token: Optional["TokenCallback"] = None) -> Dict[str, Dict[str, Any]]:
+    """Run every stage back to back on one event loop, stopping at the first failure"""
+    # Each stage needs the previous one's report, but sharing the loop keeps the
+    # Groq connection pool warm across all three instead of reconnecting per stage
+    def heading(title: str) -> None:
+        # Written to the stream only, so the three reports read as separate sections
+        if on_token:
+            on_token(f"\n\n---\n\n### {title}\n\n" if results else f"### {title}\n\n")
+    
+    results = {}
+    heading("🔍 Market Research")
+    results["market_research"] = await run_market_research(idea, api_key, on_token)
+    if 'error' in results["market_research"]:
+        return results
     
-    # Use research_execution_strategies and generate_execution_plan
-    web_research = await generator.research_execution_strategies(idea, market_report)
+    market_report = results["market_research"].get('market_research_analysis', '')
+    heading("📋 Execution Plan")
+    results["execution_plan"] = await run_execution_plan(idea, market_report, api_key, on_token)
+    if 'error' in results["execution_plan"]:
+        return results
     
-    planning_prompt = generator.get_execution_planning_prompt(
-        idea, 
-        market_report, 
-        web_research.get('research_data', '')
+    heading("🎯 Strategic Analysis")
+    results["strategic_analysis"] = await run_strategic_analysis(
+        idea,
+        market_report,
+        results["execution_plan"].get('execution_plan', ''),
+        api_key,
+        on_token
     )
+    return results
+
+class StageFailed(Exception):
+    """Raised from the cached runners so failed results are returned but never memoized"""
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get('error', 'Analysis failed'))
+        self.result = result
+
+async def _raise_on_error(stage: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    result = await stage
+    if 'error' in result:
+        raise StageFailed(result)
+    return result
+
+@st.cache_resource
+def inflight_registry() -> Tuple[threading.Lock, Dict[str, Future]]:
+    """Analyses currently running on the background loop, shared across reruns and sessions"""
+    return threading.Lock(), {}
+
+def single_flight(key: str, start: Callable[[], Awaitable[T]], sink: Optional[MarkdownSink] = None) -> T:
+    """
+    Run start() on the background loop once per key at a time and wait for its result
     
-    try:
-        completion = generator.client.chat.completions.create(
-            model=generator.reasoning_model,
-            messages=[
-                {"role": "system", "content": "You are a world-class business strategist."},
-                {"role": "user", "content": planning_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=8000,
-            top_p=0.9,
-            stream=False
-        )
+    Concurrent callers with the same key wait on the same run; only its owner streams into
+    a sink. A rerun of the owner's script leaves the run going, so its result is still
+    stored; stopping the script cancels it and a waiting session takes over.
+    """
+    lock, inflight = inflight_registry()
+    while True:
+        with lock:
+            future = inflight.get(key)
+            owner = future is None or future.cancelled()
+            if owner:
+                future = inflight[key] = asyncio.run_coroutine_threadsafe(start(), background_loop())
+        if owner:
+            future.add_done_callback(functools.partial(_unregister, key))
+        try:
+            return run_async(future, sink if owner else None)
+        except CancelledError:
+            if owner:
+                raise
+            # The owner was stopped; take over the analysis rather than give up on it
+        except StopException:
+            if owner:
+                future.cancel()
+            raise
+
+def _unregister(key: str, future: Future) -> None:
+    lock, inflight = inflight_registry()
+    with lock:
+        if inflight.get(key) is future:
+            del inflight[key]
+
+# Finished analyses are memoized on their inputs for a day. This is not st.cache_data: that would
+# record the streamed placeholder updates and fail replaying them on a hit, so the runners keep
+# their results in a cache_resource store and only stream on a miss
+RESULT_TTL = 24 * 60 * 60
+RESULT_CACHE_SIZE = 64
+
+@st.cache_resource
+def result_store() -> Tuple[threading.Lock, "OrderedDict[str, Tuple[float, Any]]"]:
+    """Finished analyses keyed on their inputs, shared across reruns and sessions"""
+    return threading.Lock(), OrderedDict()
+
+def _result_key(stage: str, *args: str) -> str:
+    return hashlib.sha256("\0".join((stage, *args)).encode('utf-8')).hexdigest()
+
+def store_memoized(result: Any, stage: str, *args: str) -> None:
+    """Record result as the outcome of stage for args"""
+    key = _result_key(stage, *args)
+    lock, results = result_store()
+    with lock:
+        results[key] = (time.monotonic(), result)
+        results.move_to_end(key)
+        while len(results) > RESULT_CACHE_SIZE:
+            results.popitem(last=False)
+
+def memoized(stage: str, *args: str, start: Callable[[], Awaitable[T]], sink: Optional[MarkdownSink] = None) -> T:
+    """Return the stored result for stage and args, running start() on a miss; StageFailed is never stored"""
+    key = _result_key(stage, *args)
+    lock, results = result_store()
+    with lock:
+        entry = results.get(key)
+        if entry and time.monotonic() - entry[0] < RESULT_TTL:
+            results.move_to_end(key)
+            return entry[1]
+    
+    # Stored from the background loop, so the result is kept even if the script reruns meanwhile
+    async def compute_and_store() -> T:
+        result = await start()
+        store_memoized(result, stage, *args)
+        return result
+    
+    # A duplicate click or another session asking for the same analysis waits for this one
+    return single_flight(key, compute_and_store, sink)
+
+# The API key and token sink are not part of the key since they do not change the result
+def cached_market_research(idea: str, api_key: str, sink: Optional[MarkdownSink] = None) -> Dict[str, Any]:
+    return memoized("market_research", idea, sink=sink, start=lambda: _raise_on_error(
+        run_market_research(idea, api_key, sink)))
+
+def cached_execution_plan(idea: str, market_report: str, api_key: str,
+                          sink: Optional[MarkdownSink] = None) -> Dict[str, Any]:
+    return memoized("execution_plan", idea, market_report, sink=sink, start=lambda: _raise_on_error(
+        run_execution_plan(idea, market_report, api_key, sink)))
+
+def cached_strategic_analysis(idea: str, market_report: str, execution_plan: str, api_key: str,
+                              sink: Optional[MarkdownSink] = None) -> Dict[str, Any]:
+    return memoized("strategic_analysis", idea, market_report, execution_plan, sink=sink, start=lambda: _raise_on_error(
+        run_strategic_analysis(idea, market_report, execution_plan, api_key, sink)))
+
+def cached_full_analysis(idea: str, api_key: str, sink: Optional[MarkdownSink] = None) -> Dict[str, Dict[str, Any]]:
+    async def start() -> Dict[str, Dict[str, Any]]:
+        results = await run_full_analysis(idea, api_key, sink)
+        if any('error' in result for result in results.values()):
+            raise StageFailed(results)
         
-        return {
-            "user_idea": idea,
-            "market_report": market_report,
-            "web_research_summary": web_research.get('research_data', ''),
-            "execution_plan": completion.choices[0].message.content,
-            "generation_timestamp": datetime.now().isoformat(),
-        }
-    except Exception as e:
-        return {"error": f"Execution planning failed: {e}"}
-
-async def run_strategic_analysis(idea: str, market_report: str, execution_plan: str, api_key: str) -> Dict[str, Any]:
-    """Run strategic analysis"""
-    analyzer = StrategicAnalyzer(api_key=api_key)
-    return await analyzer.analyze_strategy(idea, market_report, execution_plan)
+        # Seed the single-stage runners too, so a stage button for this idea is a hit
+        market_report = results["market_research"].get('market_research_analysis', '')
+        execution_plan = results["execution_plan"].get('execution_plan', '')
+        store_memoized(results["market_research"], "market_research", idea)
+        store_memoized(results["execution_plan"], "execution_plan", idea, market_report)
+        store_memoized(results["strategic_analysis"], "strategic_analysis", idea, market_report, execution_plan)
+        return results
+    
+    return memoized("full_analysis", idea, start=start, sink=sink)
+
+def run_cached(runner, *args):
+    """Call a cached runner, handing back the error result instead of raising on failure"""
+    try:
+        return runner(*args)
+    except StageFailed as e:
+        return e.result
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _combined_report_body(idea: str, report_hashes: Tuple[Optional[str], ...], _market_research: str,
+                          _execution_plan: str, _strategic_analysis: str) -> str:
+    """Combined markdown sections, rebuilt only when one of the reports changes"""
+    return f"""## Business Idea
+{idea}
+
+## Market Research
+{_market_research}
+
+## Execution Plan
+{_execution_plan}
+
+## Strategic Analysis
+{_strategic_analysis}
+"""
+
+def build_combined_report(generated: datetime, *args: Any) -> str:
+    """Combined markdown export; the timestamp is added outside the cache so it is never stale"""
+    return f"""# Innovation Agent - Complete Analysis Report
+                
+Generated: {generated.strftime("%Y-%m-%d %H:%M:%S")}
+
+{_combined_report_body(*args)}"""
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _combined_json_body(idea: str, report_hashes: Tuple[Optional[str], ...],
+                        _results: Tuple[Optional[Dict[str, Any]], ...]) -> bytes:
+    """Every analysis result as one orjson-encoded document, rebuilt only when one of the reports changes"""
+    from GroqUtils import to_json_bytes
+    return to_json_bytes({
+        "user_idea": idea,
+        **dict(zip(REPORT_FIELDS, _results)),
+    })
+
+def build_combined_json(generated: datetime, *args: Any) -> bytes:
+    """JSON export with the timestamp spliced in as the first field of the cached document"""
+    from GroqUtils import to_json_bytes
+    return b'{\n  "generated": ' + to_json_bytes(generated.isoformat()) + b',' + _combined_json_body(*args)[1:]
+
+# Reports quoted to the chatbot as (heading, session_state key, report field)
+CHAT_CONTEXT_SECTIONS = (
+    ("MARKET RESEARCH", "market_research", "market_research_analysis"),
+    ("EXECUTION PLAN", "execution_plan", "execution_plan"),
+    ("STRATEGIC ANALYSIS", "strategic_analysis", "strategic_analysis"),
+)
+CHAT_CONTEXT_CHARS = 3000
 
+@st.fragment
 def chatbot_interface():
     """Display chatbot interface"""
     st.markdown("### 💬 Ask Questions About Your Analysis")
@@ -318,68 +617,194 @@ def chatbot_interface():
         st.info("Complete at least the market research step to enable the chatbot.")
         return
     
-    # Initialize Groq client for chatbot
-    api_key = st.session_state.api_key or "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"
-    client = Groq(api_key=api_key)
-    
-    # Build context from available reports
-    context = f"USER IDEA: {st.session_state.user_idea}\n\n"
-    
-    if st.session_state.market_research:
-        context += f"MARKET RESEARCH:\n{st.session_state.market_research.get('market_research_analysis', '')}[:3000]\n\n"
+    if not st.session_state.api_key:
+        st.info("Enter a Groq API key in the sidebar to enable the chatbot.")
+        return
     
-    if st.session_state.execution_plan:
-        context += f"EXECUTION PLAN:\n{st.session_state.execution_plan.get('execution_plan', '')}[:3000]\n\n"
+    # Initialize Groq client for chatbot
+    client = get_groq(st.session_state.api_key)
     
-    if st.session_state.strategic_analysis:
-        context += f"STRATEGIC ANALYSIS:\n{st.session_state.strategic_analysis.get('strategic_analysis', '')}[:3000]\n\n"
+    # Previous turns, oldest first as in a chat transcript
+    for chat in st.session_state.chat_history:
+        with st.chat_message("user"):
+            st.markdown(chat['question'])
+        with st.chat_message("assistant"):
+            st.markdown(chat['answer'])
     
-    # Chat interface
-    user_question = st.text_input("Ask a question about your business idea:", key="chat_input")
+    # Chat interface; chat_input only triggers a rerun when a question is submitted
+    user_question = st.chat_input("Ask a question about your business idea")
     
-    if st.button("Send", key="send_chat"):
-        if user_question:
-            with st.spinner("Thinking..."):
-                try:
-                    prompt = f"""Based on the following business analysis, answer the user's question concisely and helpfully.
+    if user_question:
+        with st.chat_message("user"):
+            st.markdown(user_question)
+        
+        # Build context from available reports, each cut to its first CHAT_CONTEXT_CHARS characters
+        sections = [f"USER IDEA: {st.session_state.user_idea}"]
+        for title, state_key, report_key in CHAT_CONTEXT_SECTIONS:
+            result = st.session_state[state_key]
+            if result:
+                sections.append(f"{title}:\n{result.get(report_key, '')[:CHAT_CONTEXT_CHARS]}")
+        context = "\n\n".join(sections)
+        
+        with st.chat_message("assistant"):
+            try:
+                prompt = f"""Based on the following business analysis, answer the user's question concisely and helpfully.
 
 {context}
 
 USER QUESTION: {user_question}
 
 Provide a clear, specific answer based only on the information available in the analysis above."""
-                    
-                    response = client.chat.completions.create(
-                        model="llama-3.3-70b-versatile",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful business advisor."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.7,
-                        max_tokens=800,
-                        stream=False
-                    )
-                    
-                    answer = response.choices[0].message.content.strip()
-                    
-                    # Add to chat history
-                    st.session_state.chat_history.append({
-                        "question": user_question,
-                        "answer": answer,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    
-                except Exception as e:
-                    st.error(f"Error: {e}")
-    
-    # Display chat history
-    if st.session_state.chat_history:
-        st.markdown("### 📝 Conversation History")
-        for i, chat in enumerate(reversed(st.session_state.chat_history[-5:])):
-            with st.expander(f"Q: {chat['question'][:100]}...", expanded=(i==0)):
-                st.markdown(f"**Question:** {chat['question']}")
-                st.markdown(f"**Answer:** {chat['answer']}")
-                st.caption(f"Asked at {chat['timestamp']}")
+                
+                response = client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=[
+                        {"role": "system", "content": "You are a helpful business advisor."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=800,
+                    stream=True
+                )
+                
+                # Render the answer as it is generated rather than after the full response
+                answer = st.write_stream(
+                    chunk.choices[0].delta.content or "" for chunk in response if chunk.choices
+                ).strip()
+                
+                # Add to chat history; the deque drops the oldest turn once full
+                st.session_state.chat_history.append({
+                    "question": user_question,
+                    "answer": answer,
+                    "timestamp": datetime.now().isoformat()
+                })
+                
+            except Exception as e:
+                st.error(f"Error: {e}")
+
+# Reports tab views: label -> (session_state key, report field, heading, download filename, widget key)
+REPORT_VIEWS = {
+    "Market Research": ("market_research", "market_research_analysis", "### 🔍 Market Research Analysis",
+                        "market_research.md", "download_market"),
+    "Execution Plan": ("execution_plan", "execution_plan", "### 📋 Execution Plan",
+                       "execution_plan.md", "download_exec"),
+    "Strategic Analysis": ("strategic_analysis", "strategic_analysis", "### 🎯 Strategic Analysis",
+                           "strategic_analysis.md", "download_strat"),
+}
+
+@st.fragment
+def reports_view():
+    """Display the Reports tab; picking a report reruns only this tab"""
+    st.markdown("## 📊 Analysis Reports")
+    
+    if not st.session_state.market_research:
+        st.info("📝 Complete the analysis steps to view reports here.")
+    else:
+        # Only the selected report is rendered; sub-tabs would send all three on every rerun
+        selected = st.radio("Report", list(REPORT_VIEWS), horizontal=True,
+                            label_visibility="collapsed", key="report_view")
+        state_key, report_key, heading, filename, download_key = REPORT_VIEWS[selected]
+        result = st.session_state[state_key]
+        
+        if result and 'error' not in result:
+            report = result.get(report_key, '')
+            st.markdown(heading)
+            st.markdown(report or 'Not available')
+            
+            # Download button
+            st.download_button(
+                f"📥 Download {selected}",
+                report,
+                filename,
+                "text/markdown",
+                key=download_key
+            )
+        else:
+            st.info(f"{selected.capitalize()} not yet generated")
+
+@st.fragment
+def insights_dashboard():
+    """Display the Insights Dashboard tab"""
+    st.markdown("## 📈 Business Insights Dashboard")
+    
+    if st.session_state.current_step >= 2:
+        # Key Metrics Row
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Analysis Stage", f"{st.session_state.current_step}/5")
+        with col2:
+            web_searches = 0
+            if st.session_state.market_research:
+                web_searches = st.session_state.market_research.get('analysis_metadata', {}).get('web_searches_performed', 0)
+            st.metric("Web Searches", web_searches)
+        with col3:
+            reports_generated = sum([
+                1 for x in [st.session_state.market_research, 
+                           st.session_state.execution_plan, 
+                           st.session_state.strategic_analysis] 
+                if x and 'error' not in x
+            ])
+            st.metric("Reports Generated", f"{reports_generated}/3")
+        with col4:
+            st.metric("Chat Sessions", len(st.session_state.chat_history))
+        
+        # Analysis Summary
+        st.markdown("---")
+        st.markdown("### 🎯 Analysis Summary")
+        
+        if st.session_state.market_research and 'error' not in st.session_state.market_research:
+            with st.expander("📊 Market Opportunity Highlights", expanded=True):
+                # Extract key points from market research
+                market_text = st.session_state.market_research.get('market_research_analysis', '')
+                key_points = cached_key_points(st.session_state.report_hashes.get('market_research'), market_text)
+                for point in key_points:
+                    st.write(f"• {point}")
+        
+        if st.session_state.execution_plan and 'error' not in st.session_state.execution_plan:
+            with st.expander("🚀 Execution Milestones", expanded=True):
+                exec_text = st.session_state.execution_plan.get('execution_plan', '')
+                milestones = cached_key_points(st.session_state.report_hashes.get('execution_plan'), exec_text)
+                for milestone in milestones:
+                    st.write(f"• {milestone}")
+        
+        if st.session_state.strategic_analysis and 'error' not in st.session_state.strategic_analysis:
+            with st.expander("💡 Strategic Recommendations", expanded=True):
+                strat_text = st.session_state.strategic_analysis.get('strategic_analysis', '')
+                recommendations = cached_key_points(st.session_state.report_hashes.get('strategic_analysis'), strat_text)
+                for rec in recommendations:
+                    st.write(f"• {rec}")
+        
+        # Timeline visualization
+        if st.session_state.current_step >= 3:
+            st.markdown("---")
+            st.markdown("### 📅 Implementation Timeline")
+            
+            timeline_data = {
+                "Phase": ["Foundation", "Development", "Validation", "Scaling", "Growth"],
+                "Timeline": ["Months 1-3", "Months 2-8", "Months 6-12", "Months 10-18", "Months 16-24"],
+                "Status": ["Planning", "In Progress", "Upcoming", "Future", "Future"]
+            }
+            
+            for i, (phase, timeline, status) in enumerate(zip(
+                timeline_data["Phase"], 
+                timeline_data["Timeline"], 
+                timeline_data["Status"]
+            )):
+                col1, col2, col3 = st.columns([2, 2, 1])
+                with col1:
+                    st.write(f"**{phase}**")
+                with col2:
+                    st.write(timeline)
+                with col3:
+                    if status == "Planning":
+                        st.info(status)
+                    elif status == "In Progress":
+                        st.success(status)
+                    else:
+                        st.text(status)
+    else:
+        st.info("📊 Complete analysis steps to view insights dashboard")
 
 # Main Application
 def main():
@@ -400,11 +825,12 @@ def main():
             help="Enter your Groq API key for full functionality"
         )
         
-        if api_key:
-            st.session_state.api_key = api_key
+        # Stored stripped so pasted keys map to the same cached clients and analyzers
+        st.session_state.api_key = api_key.strip()
+        if st.session_state.api_key:
             st.success("✅ API Key configured")
         else:
-            st.warning("⚠️ Using default API key")
+            st.warning("⚠️ Enter a Groq API key or set GROQ_API_KEY to run the analyses")
         
         st.markdown("---")
         
@@ -412,37 +838,38 @@ def main():
         st.markdown("## 🚀 Quick Actions")
         
         if st.button("🔄 Reset All", key="reset_all"):
-            for key in ['current_step', 'user_idea', 'market_research', 
-                       'execution_plan', 'strategic_analysis', 'chat_history']:
-                if key in st.session_state:
-                    st.session_state[key] = "" if key == 'user_idea' else None if key != 'current_step' else 1
+            st.session_state.update(analysis_defaults())
             st.rerun()
         
         if st.button("💾 Export All Reports", key="export_all"):
             if st.session_state.market_research:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                combined_report = f"""# Innovation Agent - Complete Analysis Report
-                
-Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-## Business Idea
-{st.session_state.user_idea}
-
-## Market Research
-{st.session_state.market_research.get('market_research_analysis', 'Not available')}
-
-## Execution Plan
-{st.session_state.execution_plan.get('execution_plan', 'Not available') if st.session_state.execution_plan else 'Not generated'}
-
-## Strategic Analysis
-{st.session_state.strategic_analysis.get('strategic_analysis', 'Not available') if st.session_state.strategic_analysis else 'Not generated'}
-"""
+                generated = datetime.now()
+                timestamp = generated.strftime("%Y%m%d_%H%M%S")
+                combined_report = build_combined_report(
+                    generated,
+                    st.session_state.user_idea,
+                    tuple(st.session_state.report_hashes.get(key) for key in REPORT_FIELDS),
+                    st.session_state.market_research.get('market_research_analysis', 'Not available'),
+                    st.session_state.execution_plan.get('execution_plan', 'Not available') if st.session_state.execution_plan else 'Not generated',
+                    st.session_state.strategic_analysis.get('strategic_analysis', 'Not available') if st.session_state.strategic_analysis else 'Not generated'
+                )
                 st.download_button(
                     "📥 Download Complete Report",
                     combined_report,
                     f"innovation_report_{timestamp}.md",
                     "text/markdown"
                 )
+                st.download_button(
+                    "📥 Download as JSON",
+                    build_combined_json(
+                        generated,
+                        st.session_state.user_idea,
+                        tuple(st.session_state.report_hashes.get(key) for key in REPORT_FIELDS),
+                        tuple(st.session_state[key] for key in REPORT_FIELDS)
+                    ),
+                    f"innovation_report_{timestamp}.json",
+                    "application/json"
+                )
         
         st.markdown("---")
         
@@ -504,6 +931,24 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         if user_idea and len(user_idea) > 20:
             st.success("✅ Business idea captured!")
             
+            if st.button("⚡ Run Full Analysis", key="run_all",
+                       disabled=st.session_state.processing or not st.session_state.api_key):
+                st.session_state.processing = True
+                try:
+                    with st.spinner("⚡ Running market research, execution planning and strategic analysis... (This may take 3-5 minutes)"):
+                        results = run_cached(cached_full_analysis, user_idea, st.session_state.api_key,
+                                             MarkdownSink(st.empty()))
+                        for step, (key, result) in enumerate(results.items(), start=2):
+                            if 'error' in result:
+                                st.error(f"Error: {result['error']}")
+                                break
+                            store_result(key, result)
+                            st.session_state.current_step = max(step, st.session_state.current_step)
+                finally:
+                    # Also reached when a rerun interrupts the wait, so the buttons never stay disabled
+                    st.session_state.processing = False
+                st.rerun()
+            
             # Market Research Section
             st.markdown("---")
             st.markdown("## 🔍 Step 2: Market Research Analysis")
@@ -511,20 +956,24 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             col1, col2 = st.columns([2, 1])
             with col1:
                 if st.button("🚀 Generate Market Research", key="gen_market", 
-                           disabled=st.session_state.processing):
+                           disabled=st.session_state.processing or not st.session_state.api_key):
                     st.session_state.processing = True
-                    with st.spinner("🔍 Conducting comprehensive market research... (This may take 1-2 minutes)"):
-                        result = asyncio.run(run_market_research(
-                            user_idea,
-                            st.session_state.api_key or "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"
-                        ))
-                        if 'error' not in result:
-                            st.session_state.market_research = result
-                            st.session_state.current_step = max(2, st.session_state.current_step)
-                            st.success("✅ Market research completed!")
-                        else:
-                            st.error(f"Error: {result['error']}")
-                    st.session_state.processing = False
+                    try:
+                        with st.spinner("🔍 Conducting comprehensive market research... (This may take 1-2 minutes)"):
+                            result = run_cached(
+                                cached_market_research,
+                                user_idea,
+                                st.session_state.api_key,
+                                MarkdownSink(st.empty())
+                            )
+                            if 'error' not in result:
+                                store_result('market_research', result)
+                                st.session_state.current_step = max(2, st.session_state.current_step)
+                                st.success("✅ Market research completed!")
+                            else:
+                                st.error(f"Error: {result['error']}")
+                    finally:
+                        st.session_state.processing = False
                     st.rerun()
             
             with col2:
@@ -534,7 +983,8 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             
             if st.session_state.market_research and 'error' not in st.session_state.market_research:
                 with st.expander("📄 View Market Research Summary", expanded=True):
-                    preview = format_report_preview(
+                    preview = cached_preview(
+                        st.session_state.report_hashes.get('market_research'),
                         st.session_state.market_research.get('market_research_analysis', ''),
                         800
                     )
@@ -545,26 +995,31 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
                 st.markdown("## 📋 Step 3: Execution Plan Generation")
                 
                 if st.button("🚀 Generate Execution Plan", key="gen_exec",
-                           disabled=st.session_state.processing):
+                           disabled=st.session_state.processing or not st.session_state.api_key):
                     st.session_state.processing = True
-                    with st.spinner("📋 Creating detailed execution plan... (This may take 1-2 minutes)"):
-                        result = asyncio.run(run_execution_plan(
-                            user_idea,
-                            st.session_state.market_research.get('market_research_analysis', ''),
-                            st.session_state.api_key or "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"
-                        ))
-                        if 'error' not in result:
-                            st.session_state.execution_plan = result
-                            st.session_state.current_step = max(3, st.session_state.current_step)
-                            st.success("✅ Execution plan generated!")
-                        else:
-                            st.error(f"Error: {result['error']}")
-                    st.session_state.processing = False
+                    try:
+                        with st.spinner("📋 Creating detailed execution plan... (This may take 1-2 minutes)"):
+                            result = run_cached(
+                                cached_execution_plan,
+                                user_idea,
+                                st.session_state.market_research.get('market_research_analysis', ''),
+                                st.session_state.api_key,
+                                MarkdownSink(st.empty())
+                            )
+                            if 'error' not in result:
+                                store_result('execution_plan', result)
+                                st.session_state.current_step = max(3, st.session_state.current_step)
+                                st.success("✅ Execution plan generated!")
+                            else:
+                                st.error(f"Error: {result['error']}")
+                    finally:
+                        st.session_state.processing = False
                     st.rerun()
                 
                 if st.session_state.execution_plan and 'error' not in st.session_state.execution_plan:
                     with st.expander("📄 View Execution Plan Summary", expanded=True):
-                        preview = format_report_preview(
+                        preview = cached_preview(
+                            st.session_state.report_hashes.get('execution_plan'),
                             st.session_state.execution_plan.get('execution_plan', ''),
                             800
                         )
@@ -575,27 +1030,32 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
                     st.markdown("## 🎯 Step 4: Strategic Analysis")
                     
                     if st.button("🚀 Generate Strategic Analysis", key="gen_strat",
-                               disabled=st.session_state.processing):
+                               disabled=st.session_state.processing or not st.session_state.api_key):
                         st.session_state.processing = True
-                        with st.spinner("🎯 Performing strategic analysis... (This may take 1-2 minutes)"):
-                            result = asyncio.run(run_strategic_analysis(
-                                user_idea,
-                                st.session_state.market_research.get('market_research_analysis', ''),
-                                st.session_state.execution_plan.get('execution_plan', ''),
-                                st.session_state.api_key or "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"
-                            ))
-                            if 'error' not in result:
-                                st.session_state.strategic_analysis = result
-                                st.session_state.current_step = max(4, st.session_state.current_step)
-                                st.success("✅ Strategic analysis completed!")
-                            else:
-                                st.error(f"Error: {result['error']}")
-                        st.session_state.processing = False
+                        try:
+                            with st.spinner("🎯 Performing strategic analysis... (This may take 1-2 minutes)"):
+                                result = run_cached(
+                                    cached_strategic_analysis,
+                                    user_idea,
+                                    st.session_state.market_research.get('market_research_analysis', ''),
+                                    st.session_state.execution_plan.get('execution_plan', ''),
+                                    st.session_state.api_key,
+                                    MarkdownSink(st.empty())
+                                )
+                                if 'error' not in result:
+                                    store_result('strategic_analysis', result)
+                                    st.session_state.current_step = max(4, st.session_state.current_step)
+                                    st.success("✅ Strategic analysis completed!")
+                                else:
+                                    st.error(f"Error: {result['error']}")
+                        finally:
+                            st.session_state.processing = False
                         st.rerun()
                     
                     if st.session_state.strategic_analysis and 'error' not in st.session_state.strategic_analysis:
                         with st.expander("📄 View Strategic Analysis Summary", expanded=True):
-                            preview = format_report_preview(
+                            preview = cached_preview(
+                                st.session_state.report_hashes.get('strategic_analysis'),
                                 st.session_state.strategic_analysis.get('strategic_analysis', ''),
                                 800
                             )
@@ -606,61 +1066,7 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
     
     with tabs[1]:
         # Reports Tab
-        st.markdown("## 📊 Analysis Reports")
-        
-        if not st.session_state.market_research:
-            st.info("📝 Complete the analysis steps to view reports here.")
-        else:
-            # Create subtabs for each report
-            report_tabs = st.tabs(["Market Research", "Execution Plan", "Strategic Analysis"])
-            
-            with report_tabs[0]:
-                if st.session_state.market_research and 'error' not in st.session_state.market_research:
-                    st.markdown("### 🔍 Market Research Analysis")
-                    st.markdown(st.session_state.market_research.get('market_research_analysis', 'Not available'))
-                    
-                    # Download button
-                    st.download_button(
-                        "📥 Download Market Research",
-                        st.session_state.market_research.get('market_research_analysis', ''),
-                        "market_research.md",
-                        "text/markdown",
-                        key="download_market"
-                    )
-                else:
-                    st.info("Market research not yet generated")
-            
-            with report_tabs[1]:
-                if st.session_state.execution_plan and 'error' not in st.session_state.execution_plan:
-                    st.markdown("### 📋 Execution Plan")
-                    st.markdown(st.session_state.execution_plan.get('execution_plan', 'Not available'))
-                    
-                    # Download button
-                    st.download_button(
-                        "📥 Download Execution Plan",
-                        st.session_state.execution_plan.get('execution_plan', ''),
-                        "execution_plan.md",
-                        "text/markdown",
-                        key="download_exec"
-                    )
-                else:
-                    st.info("Execution plan not yet generated")
-            
-            with report_tabs[2]:
-                if st.session_state.strategic_analysis and 'error' not in st.session_state.strategic_analysis:
-                    st.markdown("### 🎯 Strategic Analysis")
-                    st.markdown(st.session_state.strategic_analysis.get('strategic_analysis', 'Not available'))
-                    
-                    # Download button
-                    st.download_button(
-                        "📥 Download Strategic Analysis",
-                        st.session_state.strategic_analysis.get('strategic_analysis', ''),
-                        "strategic_analysis.md",
-                        "text/markdown",
-                        key="download_strat"
-                    )
-                else:
-                    st.info("Strategic analysis not yet generated")
+        reports_view()
     
     with tabs[2]:
         # AI Assistant Tab
@@ -668,86 +1074,7 @@ Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
     
     with tabs[3]:
         # Insights Dashboard Tab
-        st.markdown("## 📈 Business Insights Dashboard")
-        
-        if st.session_state.current_step >= 2:
-            # Key Metrics Row
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Analysis Stage", f"{st.session_state.current_step}/5")
-            with col2:
-                web_searches = 0
-                if st.session_state.market_research:
-                    web_searches = st.session_state.market_research.get('analysis_metadata', {}).get('web_searches_performed', 0)
-                st.metric("Web Searches", web_searches)
-            with col3:
-                reports_generated = sum([
-                    1 for x in [st.session_state.market_research, 
-                               st.session_state.execution_plan, 
-                               st.session_state.strategic_analysis] 
-                    if x and 'error' not in x
-                ])
-                st.metric("Reports Generated", f"{reports_generated}/3")
-            with col4:
-                st.metric("Chat Sessions", len(st.session_state.chat_history))
-            
-            # Analysis Summary
-            st.markdown("---")
-            st.markdown("### 🎯 Analysis Summary")
-            
-            if st.session_state.market_research and 'error' not in st.session_state.market_research:
-                with st.expander("📊 Market Opportunity Highlights", expanded=True):
-                    # Extract key points from market research
-                    market_text = st.session_state.market_research.get('market_research_analysis', '')
-                    key_points = extract_key_points(market_text)
-                    for point in key_points:
-                        st.write(f"• {point}")
-            
-            if st.session_state.execution_plan and 'error' not in st.session_state.execution_plan:
-                with st.expander("🚀 Execution Milestones", expanded=True):
-                    exec_text = st.session_state.execution_plan.get('execution_plan', '')
-                    milestones = extract_key_points(exec_text)
-                    for milestone in milestones:
-                        st.write(f"• {milestone}")
-            
-            if st.session_state.strategic_analysis and 'error' not in st.session_state.strategic_analysis:
-                with st.expander("💡 Strategic Recommendations", expanded=True):
-                    strat_text = st.session_state.strategic_analysis.get('strategic_analysis', '')
-                    recommendations = extract_key_points(strat_text)
-                    for rec in recommendations:
-                        st.write(f"• {rec}")
-            
-            # Timeline visualization
-            if st.session_state.current_step >= 3:
-                st.markdown("---")
-                st.markdown("### 📅 Implementation Timeline")
-                
-                timeline_data = {
-                    "Phase": ["Foundation", "Development", "Validation", "Scaling", "Growth"],
-                    "Timeline": ["Months 1-3", "Months 2-8", "Months 6-12", "Months 10-18", "Months 16-24"],
-                    "Status": ["Planning", "In Progress", "Upcoming", "Future", "Future"]
-                }
-                
-                for i, (phase, timeline, status) in enumerate(zip(
-                    timeline_data["Phase"], 
-                    timeline_data["Timeline"], 
-                    timeline_data["Status"]
-                )):
-                    col1, col2, col3 = st.columns([2, 2, 1])
-                    with col1:
-                        st.write(f"**{phase}**")
-                    with col2:
-                        st.write(timeline)
-                    with col3:
-                        if status == "Planning":
-                            st.info(status)
-                        elif status == "In Progress":
-                            st.success(status)
-                        else:
-                            st.text(status)
-        else:
-            st.info("📊 Complete analysis steps to view insights dashboard")
+        insights_dashboard()
     
     # Footer
     st.markdown("---")